@@ -0,0 +1,259 @@
+import json
+import logging
+import math
+import platform
+import time
+import tracemalloc
+
+import django
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.db.models import Count, Q
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.v1.constants import BENCHMARK_ADMIN, BENCHMARK_OUTPUT, BENCHMARK_RUNS
+from api.v1.urls import v1_router
+from reviews.constants import (FAKE_DATA_COMMENTS, FAKE_DATA_REVIEWS,
+                               FAKE_DATA_SEED, FAKE_DATA_TITLES,
+                               FAKE_DATA_USERS)
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+
+def get_percentile(values, percent):
+    values = sorted(values)
+    position = (len(values) - 1) * percent / 100
+    lower = values[math.floor(position)]
+    upper = values[math.ceil(position)]
+    return lower + (upper - lower) * (position - math.floor(position))
+
+
+class Command(BaseCommand):
+    help = 'Measure latency, queries and memory of every GET route of v1'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=FAKE_DATA_USERS)
+        parser.add_argument('--titles', type=int, default=FAKE_DATA_TITLES)
+        parser.add_argument('--reviews', type=int, default=FAKE_DATA_REVIEWS)
+        parser.add_argument(
+            '--comments', type=int, default=FAKE_DATA_COMMENTS
+        )
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=BENCHMARK_RUNS,
+            help='Number of timed requests per route and client.'
+        )
+        parser.add_argument('--seed', type=int, default=FAKE_DATA_SEED)
+        parser.add_argument(
+            '--output',
+            default=BENCHMARK_OUTPUT,
+            help='File the JSON results are written to.'
+        )
+        parser.add_argument(
+            '--warm-cache',
+            action='store_true',
+            help='Keep the response cache between timed requests.'
+        )
+        parser.add_argument(
+            '--bitmap-index',
+            action='store_true',
+            help=(
+                'Filter the title list with the in-memory bitmap index '
+                'instead of SQL.'
+            )
+        )
+        parser.add_argument(
+            '--current-db',
+            action='store_true',
+            help=(
+                'Benchmark the rows of the configured database as they are '
+                'instead of seeding a fresh test database.'
+            )
+        )
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError('--runs must be positive.')
+        self.options = options
+        for name in ('django.request', 'api.performance'):
+            logging.getLogger(name).setLevel(logging.ERROR)
+        with override_settings(TITLE_BITMAP_INDEX=options['bitmap_index']):
+            if options['current_db']:
+                report = self.benchmark()
+            else:
+                old_name = connection.creation.create_test_db(
+                    verbosity=0, autoclobber=True, serialize=False
+                )
+                try:
+                    report = self.benchmark()
+                finally:
+                    connection.creation.destroy_test_db(old_name, verbosity=0)
+        with open(options['output'], 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        self.stdout.write(f'Results written to {options["output"]}')
+
+    def benchmark(self):
+        started = time.perf_counter()
+        if self.options['current_db']:
+            admin = self.get_admin()
+        else:
+            admin = self.seed()
+        seed_seconds = time.perf_counter() - started
+        clients = {
+            'anonymous': Client(),
+            'admin': Client(
+                HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(admin)}'
+            ),
+        }
+        results = []
+        for name, url in self.get_routes(admin):
+            for client_name, client in clients.items():
+                results.append({
+                    'route': name,
+                    'url': url,
+                    'client': client_name,
+                    **self.measure(client, url),
+                })
+        return {
+            'meta': {
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'runs': self.options['runs'],
+                'warm_cache': self.options['warm_cache'],
+                'bitmap_index': self.options['bitmap_index'],
+                'seed_seconds': round(seed_seconds, 3),
+                'dataset': {
+                    model._meta.model_name: model.objects.count()
+                    for model in (User, Title, Review, Comment)
+                },
+            },
+            'results': results,
+        }
+
+    def seed(self):
+        options = self.options
+        call_command(
+            'generate_fake_data',
+            users=options['users'],
+            titles=options['titles'],
+            reviews=options['reviews'],
+            comments=options['comments'],
+            seed=options['seed'],
+            stdout=self.stdout,
+        )
+        return User.objects.create(
+            username=BENCHMARK_ADMIN,
+            email=f'{BENCHMARK_ADMIN}@yamdb.fake',
+            role=User.ADMIN,
+        )
+
+    def get_admin(self):
+        admin = User.objects.filter(
+            Q(role=User.ADMIN) | Q(is_staff=True)
+        ).order_by('id').first()
+        if admin is None:
+            raise CommandError('--current-db needs an existing administrator.')
+        if not Title.objects.exists():
+            raise CommandError('--current-db needs at least one title.')
+        return admin
+
+    def get_samples(self, admin):
+        title = Title.objects.order_by('-review_count', 'id').first()
+        review = Review.objects.filter(title=title).annotate(
+            comments_total=Count('comments')
+        ).order_by('-comments_total', 'id').first()
+        comment = Comment.objects.filter(review=review).first()
+        return {
+            'users': {'username': admin.username},
+            'categories': {'slug': Category.objects.first().slug},
+            'genres': {'slug': Genre.objects.first().slug},
+            'titles': {'pk': title.pk},
+            'title_filters': self.get_title_filters(title),
+            'reviews': {'title_id': title.pk, 'pk': review.pk},
+            'comments': {
+                'title_id': title.pk,
+                'review_id': review.pk,
+                'pk': comment.pk if comment else None,
+            },
+        }
+
+    def get_title_filters(self, title):
+        genre = title.genre.first()
+        filters = {
+            'genre': genre.slug if genre else None,
+            'category': title.category.slug if title.category else None,
+            'year': title.year,
+        }
+        queries = [
+            f'{name}={value}' for name, value in filters.items()
+            if value is not None
+        ]
+        return [*queries[:-1], '&'.join(queries)]
+
+    def get_routes(self, admin):
+        samples = self.get_samples(admin)
+        for pattern in v1_router.urls:
+            arguments = pattern.pattern.regex.groupindex
+            if 'format' in arguments:
+                continue
+            actions = getattr(pattern.callback, 'actions', {'get': None})
+            if 'get' not in actions:
+                continue
+            basename = pattern.callback.initkwargs.get('basename')
+            kwargs = {
+                argument: samples[basename][argument]
+                for argument in arguments
+            }
+            if None in kwargs.values():
+                continue
+            yield pattern.name, reverse(f'api:{pattern.name}', kwargs=kwargs)
+        titles_url = reverse('api:titles-list')
+        for query in samples['title_filters']:
+            yield 'titles-list', f'{titles_url}?{query}'
+
+    def clear_responses(self):
+        cache.clear()
+
+    def request(self, client, url):
+        if not self.options['warm_cache']:
+            self.clear_responses()
+        response = client.get(url)
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            size = len(response.content)
+        return response, size
+
+    def measure(self, client, url):
+        self.request(client, url)
+        timings = []
+        for _ in range(self.options['runs']):
+            started = time.perf_counter()
+            response, size = self.request(client, url)
+            timings.append((time.perf_counter() - started) * 1000)
+        reset_queries()
+        with CaptureQueriesContext(connection) as context:
+            self.request(client, url)
+        queries = len(context)
+        tracemalloc.start()
+        try:
+            self.request(client, url)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return {
+            'status': response.status_code,
+            'response_bytes': size,
+            'p50_ms': round(get_percentile(timings, 50), 3),
+            'p95_ms': round(get_percentile(timings, 95), 3),
+            'mean_ms': round(sum(timings) / len(timings), 3),
+            'queries': queries,
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
@@ -0,0 +1,133 @@
+import json
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+from api.v1.constants import (PERFORMANCE_HEADERS_ALWAYS,
+                              PERFORMANCE_HEADERS_REQUEST,
+                              PERFORMANCE_HEADERS_STAFF,
+                              PERFORMANCE_REQUEST_HEADER)
+
+logger = logging.getLogger('api.performance')
+
+
+class RequestProfile:
+    """Timings of a single request.
+
+    Stages may nest; each stage is charged only with the time not spent in
+    the stages opened inside it.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = None
+        self.db_time = 0
+        self.queries = 0
+        self.stages = {}
+        self.user = None
+        self.open_stages = []
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+    def begin(self, name):
+        self.open_stages.append([name, time.perf_counter(), 0])
+
+    def end(self):
+        name, started, nested = self.open_stages.pop()
+        elapsed = time.perf_counter() - started
+        self.add(name, elapsed - nested)
+        if self.open_stages:
+            self.open_stages[-1][2] += elapsed
+
+    def add(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0) + seconds
+
+    @contextmanager
+    def stage(self, name):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end()
+
+    def finish(self):
+        self.total = time.perf_counter() - self.started
+
+    def get_server_timing(self):
+        metrics = [
+            ('total', self.total),
+            ('db', self.db_time),
+            *self.stages.items(),
+        ]
+        timing = ', '.join(
+            f'{name};dur={seconds * 1000:.2f}' for name, seconds in metrics
+        )
+        return f'{timing}, queries;desc="{self.queries}"'
+
+
+class PerformanceMiddleware:
+    """Profile every request, log the result and expose it in headers.
+
+    `PERFORMANCE_HEADERS` controls who gets the `Server-Timing` and
+    `X-Query-Count` headers: 'always', 'staff', 'request' (clients that
+    send the `X-Profile` header) or None.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = request.profile = RequestProfile()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(
+                    connections[alias].execute_wrapper(profile.record_query)
+                )
+            response = self.get_response(request)
+        profile.finish()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(
+                self.get_record(request, response, profile),
+                ensure_ascii=False
+            ))
+        if self.should_expose(request, profile):
+            response['Server-Timing'] = profile.get_server_timing()
+            response['X-Query-Count'] = profile.queries
+        return response
+
+    def get_record(self, request, response, profile):
+        return {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'user': getattr(profile.user, 'pk', None),
+            'total_ms': round(profile.total * 1000, 3),
+            'db_ms': round(profile.db_time * 1000, 3),
+            'queries': profile.queries,
+            'stages_ms': {
+                name: round(seconds * 1000, 3)
+                for name, seconds in profile.stages.items()
+            },
+            'response_bytes': (
+                None if response.streaming else len(response.content)
+            ),
+        }
+
+    def should_expose(self, request, profile):
+        mode = getattr(settings, 'PERFORMANCE_HEADERS', None)
+        if mode == PERFORMANCE_HEADERS_ALWAYS:
+            return True
+        if mode == PERFORMANCE_HEADERS_REQUEST:
+            return PERFORMANCE_REQUEST_HEADER in request.headers
+        if mode == PERFORMANCE_HEADERS_STAFF:
+            return getattr(profile.user, 'is_admin', False)
+        return False
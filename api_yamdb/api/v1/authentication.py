@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from api.v1.constants import AUTH_CACHE_SIZE, AUTH_CACHE_TTL
+from reviews.models import User
+
+SNAPSHOT_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields
+    if field.attname in (
+        'id', 'username', 'role', 'is_staff', 'is_superuser', 'is_active'
+    )
+)
+
+
+class UserSnapshotCache:
+    """Bounded LRU of verified tokens and the user fields they resolve to.
+
+    The cache lives in the process, so entries expire after `ttl` seconds
+    to bound how long another worker may keep a stale role.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, raw_token):
+        with self.lock:
+            entry = self.entries.get(raw_token)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self.entries[raw_token]
+                return None
+            self.entries.move_to_end(raw_token)
+        _, validated_token, values = entry
+        return User.from_db(DEFAULT_DB_ALIAS, SNAPSHOT_FIELDS, values), (
+            validated_token
+        )
+
+    def set(self, raw_token, validated_token, user):
+        expires = min(time.time() + self.ttl, validated_token['exp'])
+        values = tuple(getattr(user, field) for field in SNAPSHOT_FIELDS)
+        with self.lock:
+            self.entries[raw_token] = (expires, validated_token, values)
+            self.entries.move_to_end(raw_token)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def invalidate_user(self, user_id):
+        with self.lock:
+            for raw_token, (_, _, values) in list(self.entries.items()):
+                if values[SNAPSHOT_FIELDS.index('id')] == user_id:
+                    del self.entries[raw_token]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+user_cache = UserSnapshotCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        cached = user_cache.get(raw_token)
+        if cached is not None:
+            return cached
+        validated_token = self.get_validated_token(raw_token)
+        user = self.get_user(validated_token)
+        user_cache.set(raw_token, validated_token, user)
+        return user, validated_token
@@ -0,0 +1,146 @@
+import threading
+
+from api.v1.cache import get_version
+from reviews.models import Title
+
+GenreTitle = Title.genre.through
+
+BYTE_BITS = tuple(
+    tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)
+)
+
+
+def get_bits(ranks, size):
+    data = bytearray((size + 7) // 8)
+    for rank in ranks:
+        data[rank >> 3] |= 1 << (rank & 7)
+    return int.from_bytes(data, 'little')
+
+
+def get_bit_count(bits):
+    return bin(bits).count('1')
+
+
+def get_ranks(bits, start, stop):
+    """Positions of the set bits from the `start`-th to the `stop`-th."""
+    ranks, seen = [], 0
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+    for offset, byte in enumerate(data):
+        if not byte:
+            continue
+        positions = BYTE_BITS[byte]
+        if seen + len(positions) <= start:
+            seen += len(positions)
+            continue
+        for bit in positions:
+            if seen >= stop:
+                return ranks
+            if seen >= start:
+                ranks.append(offset * 8 + bit)
+            seen += 1
+    return ranks
+
+
+class TitleBitmapState:
+
+    def __init__(self, version, ids, genres, categories, years):
+        self.version = version
+        self.ids = ids
+        self.all = (1 << len(ids)) - 1
+        self.genres = genres
+        self.categories = categories
+        self.years = years
+
+    @classmethod
+    def build(cls, version):
+        ids, ranks = [], {}
+        categories, years = {}, {}
+        for rank, (title_id, category, year) in enumerate(
+            Title.objects.order_by('name', 'id').values_list(
+                'id', 'category__slug', 'year'
+            )
+        ):
+            ids.append(title_id)
+            ranks[title_id] = rank
+            if category is not None:
+                categories.setdefault(category.lower(), []).append(rank)
+            years.setdefault(year, []).append(rank)
+        genres = {}
+        for title_id, genre in GenreTitle.objects.order_by().values_list(
+            'title_id', 'genre__slug'
+        ):
+            genres.setdefault(genre.lower(), []).append(ranks[title_id])
+        size = len(ids)
+        return cls(version, ids, *(
+            {key: get_bits(values, size) for key, values in groups.items()}
+            for groups in (genres, categories, years)
+        ))
+
+    def filter(self, genre=None, category=None, year=None):
+        bits = self.all
+        if genre not in (None, ''):
+            bits &= self.genres.get(genre.lower(), 0)
+        if category not in (None, ''):
+            bits &= self.categories.get(category.lower(), 0)
+        if year is not None:
+            bits &= self.years.get(year, 0)
+        return bits
+
+
+class TitleBitmapIndex:
+    """Per-process bitsets of titles for every genre, category and year.
+
+    Bit `n` stands for the n-th title in ('name', 'id') order, so the set
+    bits of a filter list titles in the order of the catalog. The index is
+    rebuilt on first use after the `title_index` version changes, which
+    only title, genre and category writes bump: reviews do not affect it.
+    """
+
+    def __init__(self):
+        self.state = None
+        self.lock = threading.Lock()
+
+    def get_state(self):
+        version, _ = get_version('title_index')
+        state = self.state
+        if state is not None and state.version == version:
+            return state
+        with self.lock:
+            if self.state is None or self.state.version != version:
+                self.state = TitleBitmapState.build(version)
+            return self.state
+
+    def filter(self, queryset, **filters):
+        state = self.get_state()
+        return TitleBitmapSequence(state, state.filter(**filters), queryset)
+
+
+class TitleBitmapSequence:
+    """Filtered titles for `Paginator`: counted from the bitset and loaded
+    one page at a time with a single `id__in` query.
+    """
+
+    def __init__(self, state, bits, queryset):
+        self.state = state
+        self.bits = bits
+        self.queryset = queryset
+
+    def count(self):
+        return get_bit_count(self.bits)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return self[item:item + 1][0]
+        start, stop, _ = item.indices(self.count())
+        ids = [
+            self.state.ids[rank]
+            for rank in get_ranks(self.bits, start, stop)
+        ]
+        titles = self.queryset.in_bulk(ids)
+        return [titles[title_id] for title_id in ids if title_id in titles]
+
+
+title_index = TitleBitmapIndex()
@@ -0,0 +1,57 @@
+import hashlib
+import time
+
+from django.core.cache import caches
+
+from api.v1.constants import CACHE_KEY_PREFIX, VERSION_CACHE_ALIAS
+
+
+def get_version_keys(resource):
+    version_key = f'{CACHE_KEY_PREFIX}:version:{resource}'
+    return version_key, f'{version_key}:modified'
+
+
+def get_version(resource):
+    """Version and modification time of `resource`, shared by all workers
+    through the `versions` cache.
+    """
+    versions = caches[VERSION_CACHE_ALIAS]
+    version_key, modified_key = get_version_keys(resource)
+    stamps = versions.get_many([version_key, modified_key])
+    if len(stamps) < 2:
+        versions.add(version_key, time.time_ns(), timeout=None)
+        versions.add(modified_key, time.time(), timeout=None)
+        stamps = versions.get_many([version_key, modified_key])
+    return stamps[version_key], stamps[modified_key]
+
+
+def bump_versions(*resources):
+    """Give every resource a new version: a fresh timestamp rather than an
+    increment, which not every shared backend performs atomically.
+    """
+    versions = caches[VERSION_CACHE_ALIAS]
+    for resource in resources:
+        version_key, modified_key = get_version_keys(resource)
+        versions.set_many(
+            {version_key: time.time_ns(), modified_key: time.time()},
+            timeout=None
+        )
+
+
+def get_response_fingerprint(request, resource):
+    version, modified = get_version(resource)
+    fingerprint = '|'.join((
+        request.build_absolute_uri(),
+        getattr(request, 'accepted_media_type', ''),
+        resource,
+        str(version)
+    ))
+    return hashlib.md5(fingerprint.encode()).hexdigest(), modified
+
+
+def get_response_cache_key(fingerprint):
+    return f'{CACHE_KEY_PREFIX}:response:{fingerprint}'
+
+
+def get_facets_cache_key(resource, version):
+    return f'{CACHE_KEY_PREFIX}:facets:{resource}:{version}'
@@ -10,3 +10,31 @@ USERNAME_REGEX = r'^[\w.@+-]+'
 RESERVED_USERNAME = 'me'
 MIN_SCORE = 1
 MAX_SCORE = 10
+STATS_PERCENTILES = (10, 25, 75, 90)
+CACHE_KEY_PREFIX = 'api:v1'
+VERSION_CACHE_ALIAS = 'versions'
+RESPONSE_CACHE_TIMEOUT = 60 * 5
+AUTH_CACHE_SIZE = 1024
+AUTH_CACHE_TTL = 60
+BULK_REVIEWS_MAX_SIZE = 1000
+MAX_OBJECT_ID = 2 ** 63 - 1
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FIELDS = (
+    'id', 'name', 'year', 'description', 'category', 'genre', 'rating',
+    'review_count',
+)
+EXPORT_TYPE_PARAM = 'type'
+DEFAULT_EXPORT_TYPE = 'ndjson'
+STREAM_PARAM = 'stream'
+STREAM_CHUNK_SIZE = 500
+BENCHMARK_RUNS = 20
+BENCHMARK_OUTPUT = 'benchmark.json'
+BENCHMARK_ADMIN = 'benchmark_admin'
+PERFORMANCE_HEADERS_ALWAYS = 'always'
+PERFORMANCE_HEADERS_STAFF = 'staff'
+PERFORMANCE_HEADERS_REQUEST = 'request'
+PERFORMANCE_REQUEST_HEADER = 'X-Profile'
+RANKING_SIZE = 10
+RANKING_MAX_SIZE = 100
+FACETS_PARAM = 'facets'
+TITLE_FACETS = ('genre', 'category', 'year')
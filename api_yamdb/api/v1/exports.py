@@ -0,0 +1,69 @@
+import csv
+import json
+from itertools import islice
+
+from api.v1.constants import EXPORT_CHUNK_SIZE, EXPORT_FIELDS
+from reviews.models import Title
+
+GenreTitle = Title.genre.through
+
+
+class Echo:
+
+    def write(self, value):
+        return value
+
+
+def iter_title_chunks(chunk_size=EXPORT_CHUNK_SIZE):
+    titles = Title.objects.select_related('category').order_by('id').only(
+        'id', 'name', 'year', 'description', 'rating', 'review_count',
+        'category__slug'
+    ).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(titles, chunk_size))
+        if not chunk:
+            return
+        genres = {}
+        for title_id, slug in GenreTitle.objects.filter(
+            title_id__in=[title.id for title in chunk]
+        ).order_by('genre__slug').values_list('title_id', 'genre__slug'):
+            genres.setdefault(title_id, []).append(slug)
+        yield [
+            {
+                'id': title.id,
+                'name': title.name,
+                'year': title.year,
+                'description': title.description,
+                'category': title.category.slug if title.category else None,
+                'genre': genres.get(title.id, []),
+                'rating': title.rating,
+                'review_count': title.review_count,
+            }
+            for title in chunk
+        ]
+
+
+def export_ndjson(chunk_size=EXPORT_CHUNK_SIZE):
+    for chunk in iter_title_chunks(chunk_size):
+        yield ''.join(
+            json.dumps(row, ensure_ascii=False) + '\n' for row in chunk
+        )
+
+
+def export_csv(chunk_size=EXPORT_CHUNK_SIZE):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for chunk in iter_title_chunks(chunk_size):
+        yield ''.join(
+            writer.writerow([
+                ','.join(row[field]) if field == 'genre' else row[field]
+                for field in EXPORT_FIELDS
+            ])
+            for row in chunk
+        )
+
+
+EXPORTERS = {
+    'ndjson': (export_ndjson, 'application/x-ndjson'),
+    'csv': (export_csv, 'text/csv'),
+}
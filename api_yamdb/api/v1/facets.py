@@ -0,0 +1,57 @@
+from collections import Counter
+
+from django.db.models import Count
+
+from reviews.models import Title
+
+GenreTitle = Title.genre.through
+
+
+def get_group_facet(counts, names):
+    return [
+        {'slug': slug, 'name': names[slug], 'count': count}
+        for slug, count in sorted(
+            counts.items(), key=lambda item: (-item[1], names[item[0]])
+        )
+    ]
+
+
+def get_category_year_facets(titles):
+    """Count categories and years with one query grouped by both."""
+    categories, names, years = Counter(), {}, Counter()
+    for row in titles.values(
+        'year', 'category__slug', 'category__name'
+    ).annotate(count=Count('id', distinct=True)):
+        years[row['year']] += row['count']
+        if row['category__slug'] is not None:
+            categories[row['category__slug']] += row['count']
+            names[row['category__slug']] = row['category__name']
+    return {
+        'category': get_group_facet(categories, names),
+        'year': [
+            {'year': year, 'count': count}
+            for year, count in sorted(years.items(), reverse=True)
+        ],
+    }
+
+
+def get_genre_facets(titles):
+    counts, names = {}, {}
+    for row in GenreTitle.objects.filter(
+        title_id__in=titles.values('id')
+    ).order_by().values('genre__slug', 'genre__name').annotate(
+        count=Count('title_id', distinct=True)
+    ):
+        counts[row['genre__slug']] = row['count']
+        names[row['genre__slug']] = row['genre__name']
+    return {'genre': get_group_facet(counts, names)}
+
+
+def get_title_facets(queryset, facets):
+    titles = queryset.order_by().prefetch_related(None)
+    result = {}
+    if 'category' in facets or 'year' in facets:
+        result.update(get_category_year_facets(titles))
+    if 'genre' in facets:
+        result.update(get_genre_facets(titles))
+    return {name: result[name] for name in facets}
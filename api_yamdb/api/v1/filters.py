@@ -1,5 +1,6 @@
 from django_filters import CharFilter
 from django_filters.rest_framework import FilterSet
+from rest_framework.filters import BaseFilterBackend
 
 from reviews.models import Title
 
@@ -21,3 +22,11 @@ class TitleFilter(FilterSet):
     class Meta:
         model = Title
         fields = ["genre", "category", "name", "year"]
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '')
+        return queryset.search(text) if text.strip() else queryset
@@ -0,0 +1,170 @@
+import time
+from contextlib import nullcontext
+from itertools import islice
+
+from django.core.cache import cache
+from django.db.models import prefetch_related_objects
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from api.v1.cache import get_response_cache_key, get_response_fingerprint
+from api.v1.constants import (RESPONSE_CACHE_TIMEOUT, STREAM_CHUNK_SIZE,
+                              STREAM_PARAM)
+from api.v1.renderers import StreamingJSONRenderer
+
+
+class BaseCachedResponseMixin:
+    """Serve cached response data with a strong `ETag`.
+
+    Conditional requests are answered after the handler (or the cache)
+    produced a 200, so missing objects still get 404. Freshness is decided
+    by the `ETag` alone: `Last-Modified` has a one second resolution and
+    is sent for information only.
+    """
+
+    cache_resource = None
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        fingerprint, modified = get_response_fingerprint(
+            request, self.cache_resource
+        )
+        key = get_response_cache_key(fingerprint)
+        data = cache.get(key)
+        if data is not None:
+            response = Response(data, status=status.HTTP_200_OK)
+        else:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            cache.set(key, response.data, RESPONSE_CACHE_TIMEOUT)
+        etag = quote_etag(fingerprint)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(modified)
+        return get_conditional_response(
+            request, etag=etag, response=response
+        ) or response
+
+
+class CachedListMixin(BaseCachedResponseMixin):
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class CachedRetrieveMixin(BaseCachedResponseMixin):
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class CachedResponseMixin(CachedListMixin, CachedRetrieveMixin):
+    pass
+
+
+class StreamingListMixin:
+    """List without pagination as a streamed JSON array on `?stream=true`.
+
+    Only administrators may stream; other clients get the paginated list.
+    Objects are read with `QuerySet.iterator()` and serialized chunk by
+    chunk; prefetches of the queryset are applied to every chunk.
+    """
+
+    stream_chunk_size = STREAM_CHUNK_SIZE
+
+    def is_stream_request(self, request):
+        return (
+            request.query_params.get(STREAM_PARAM) in ('true', '1')
+            and request.user.is_authenticated
+            and request.user.is_admin
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_stream_request(request):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        renderer = StreamingJSONRenderer()
+        return StreamingHttpResponse(
+            renderer.render_stream(self.serialize_chunks(queryset)),
+            content_type=renderer.media_type
+        )
+
+    def serialize_chunks(self, queryset):
+        lookups = queryset._prefetch_related_lookups
+        objects = queryset.iterator(chunk_size=self.stream_chunk_size)
+        while True:
+            chunk = list(islice(objects, self.stream_chunk_size))
+            if not chunk:
+                return
+            if lookups:
+                prefetch_related_objects(chunk, *lookups)
+            yield self.get_serializer(chunk, many=True).data
+
+
+class ProfiledViewMixin:
+    """Split the request profile into auth, permissions, queryset,
+    serialize and render stages.
+
+    The `serialize` stage is the handler itself without the time spent
+    loading the queryset or the object.
+    """
+
+    def get_profile(self):
+        return getattr(self.request, 'profile', None)
+
+    def profile_stage(self, name):
+        profile = self.get_profile()
+        return profile.stage(name) if profile else nullcontext()
+
+    def perform_authentication(self, request):
+        with self.profile_stage('auth'):
+            super().perform_authentication(request)
+        profile = self.get_profile()
+        if profile:
+            profile.user = request.user
+
+    def check_permissions(self, request):
+        with self.profile_stage('permissions'):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with self.profile_stage('permissions'):
+            super().check_object_permissions(request, obj)
+
+    def paginate_queryset(self, queryset):
+        with self.profile_stage('queryset'):
+            return super().paginate_queryset(queryset)
+
+    def get_object(self):
+        with self.profile_stage('queryset'):
+            return super().get_object()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        profile = self.get_profile()
+        if profile:
+            profile.begin('serialize')
+            self.profiled_handler = True
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        profile = self.get_profile()
+        if profile and getattr(self, 'profiled_handler', False):
+            profile.end()
+            self.profiled_handler = False
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if profile and hasattr(response, 'add_post_render_callback'):
+            started = time.perf_counter()
+            response.add_post_render_callback(
+                lambda response: profile.add(
+                    'render', time.perf_counter() - started
+                )
+            )
+        return response
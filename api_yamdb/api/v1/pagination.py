@@ -0,0 +1,61 @@
+from rest_framework.pagination import (BasePagination, CursorPagination,
+                                       PageNumberPagination)
+
+
+class TitleCursorPagination(CursorPagination):
+    ordering = ('name', 'id')
+
+
+class PublishedContentCursorPagination(CursorPagination):
+    ordering = ('-pub_date', '-id')
+
+
+class CursorOptInPagination(BasePagination):
+    """Page-number pagination that switches to cursor mode on `?cursor`.
+
+    An empty `?cursor=` requests the first page; the `next` and `previous`
+    links then carry opaque cursors and no count query is made.
+    """
+
+    page_number_class = PageNumberPagination
+    cursor_class = CursorPagination
+
+    def __init__(self):
+        self.page_number = self.page_number_class()
+        self.cursor = self.cursor_class()
+        self.paginator = self.page_number
+
+    def is_cursor_request(self, request):
+        return self.cursor.cursor_query_param in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_cursor_request(request):
+            self.paginator = self.cursor
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number.get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return (
+            self.page_number.get_schema_operation_parameters(view)
+            + self.cursor.get_schema_operation_parameters(view)
+        )
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, 'display_page_controls', False)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+
+class TitlePagination(CursorOptInPagination):
+    cursor_class = TitleCursorPagination
+
+
+class PublishedContentPagination(CursorOptInPagination):
+    cursor_class = PublishedContentCursorPagination
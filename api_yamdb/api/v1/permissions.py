@@ -18,7 +18,7 @@ class IsOwnerOrStaff(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         return request.method in permissions.SAFE_METHODS or (
             request.user.is_authenticated and (
-                obj.author == request.user
+                obj.author_id == request.user.id
                 or request.user.is_admin
                 or request.user.is_moderator
             )
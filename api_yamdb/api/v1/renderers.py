@@ -0,0 +1,19 @@
+from rest_framework.renderers import JSONRenderer
+
+
+class StreamingJSONRenderer(JSONRenderer):
+    """Render a JSON array from an iterable of already serialized chunks.
+
+    Every chunk is encoded on its own, so only one chunk is held in memory
+    at a time no matter how long the array is.
+    """
+
+    def render_stream(self, chunks):
+        yield b'['
+        separator = b''
+        for chunk in chunks:
+            if not chunk:
+                continue
+            yield separator + self.render(chunk)[1:-1]
+            separator = b','
+        yield b']'
@@ -1,12 +1,20 @@
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
-from rest_framework import serializers
-
-from api.v1.constants import (EMAIL_MAX_LENGTH, MAX_SCORE, MIN_SCORE,
-                              USERNAME_MAX_LENGTH)
+from rest_framework import serializers, status
+from rest_framework.settings import api_settings
+
+from api.v1.cache import bump_versions
+from api.v1.constants import (BULK_REVIEWS_MAX_SIZE, EMAIL_MAX_LENGTH,
+                              MAX_OBJECT_ID, MAX_SCORE, MIN_SCORE,
+                              RANKING_MAX_SIZE, RANKING_SIZE,
+                              STATS_PERCENTILES, USERNAME_MAX_LENGTH)
+from api.v1.utils import (get_score_distribution, get_score_mean,
+                          get_score_percentile)
 from api_yamdb.settings import FROM_EMAIL
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.models import (Category, Comment, Genre, OutgoingEmail, Review,
+                            Title, TitleRanking, TitleScoreCount, User)
 from reviews.validators import ValidateUsername
 
 
@@ -37,28 +45,33 @@ class SingupSerializer(serializers.Serializer, ValidateUsername):
     )
 
     def create(self, validated_data):
-        user, _ = User.objects.get_or_create(**validated_data)
-        confirmation_code = default_token_generator.make_token(user)
-        send_mail(
-            subject='Код подтверждения',
-            from_email=FROM_EMAIL,
-            message=f'{confirmation_code}',
-            recipient_list=[user.email]
-        )
+        with transaction.atomic():
+            try:
+                user = self.user or User.objects.create(**validated_data)
+            except IntegrityError:
+                raise serializers.ValidationError(
+                    'Такое имя или почта уже заняты!'
+                )
+            confirmation_code = default_token_generator.make_token(user)
+            OutgoingEmail.objects.create(
+                subject='Код подтверждения',
+                from_email=FROM_EMAIL,
+                message=f'{confirmation_code}',
+                recipient=user.email
+            )
         return user
 
     def validate(self, data):
         email = data.get('email')
         username = data.get('username')
-        if User.objects.filter(username=username, email=email).exists():
-            return data
-        if (
-            User.objects.filter(username=username).exists()
-            or User.objects.filter(email=email).exists()
-        ):
-            raise serializers.ValidationError(
-                'Такое имя или почта уже заняты!'
-            )
+        users = User.objects.filter(Q(username=username) | Q(email=email))
+        self.user = None
+        for user in users[:2]:
+            if user.username != username or user.email != email:
+                raise serializers.ValidationError(
+                    'Такое имя или почта уже заняты!'
+                )
+            self.user = user
         return data
 
 
@@ -101,17 +114,116 @@ class ReviewSerializer(serializers.ModelSerializer):
             )
         return value
 
-    def validate(self, data):
-        request = self.context['request']
-        title_id = self.context['view'].kwargs.get('title_id')
-        user = request.user
+    def create(self, validated_data):
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                title=validated_data['title'],
+                author=validated_data['author']
+            ).exists():
+                raise
+        raise serializers.ValidationError({
+            api_settings.NON_FIELD_ERRORS_KEY: [
+                'Вы уже оставили отзыв на это произведение.'
+            ]
+        })
+
+
+class BulkReviewItemSerializer(serializers.Serializer):
+    title_id = serializers.IntegerField(min_value=1, max_value=MAX_OBJECT_ID)
+    text = serializers.CharField()
+    score = serializers.IntegerField(min_value=MIN_SCORE, max_value=MAX_SCORE)
+
+
+class BulkReviewSerializer(serializers.BaseSerializer):
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list) or not data:
+            raise serializers.ValidationError(
+                'Ожидается непустой список отзывов.'
+            )
+        if len(data) > BULK_REVIEWS_MAX_SIZE:
+            raise serializers.ValidationError(
+                f'Нельзя отправить больше {BULK_REVIEWS_MAX_SIZE} отзывов '
+                'за один запрос.'
+            )
+        return data
 
-        if request.method == 'POST':
-            if Review.objects.filter(title_id=title_id, author=user).exists():
-                raise serializers.ValidationError(
-                    "Вы уже оставили отзыв на это произведение."
+    def to_representation(self, instance):
+        return instance
+
+    def save(self, **kwargs):
+        self.instance = self.create(self.validated_data)
+        return self.instance
+
+    def create(self, validated_data):
+        author = self.context['request'].user
+        results = [None] * len(validated_data)
+        items = {}
+        for index, item in enumerate(validated_data):
+            serializer = BulkReviewItemSerializer(data=item)
+            if serializer.is_valid():
+                items[index] = serializer.validated_data
+            else:
+                results[index] = self.get_error(index, serializer.errors)
+
+        title_ids = {item['title_id'] for item in items.values()}
+        existing_title_ids = set(Title.objects.filter(
+            id__in=title_ids
+        ).values_list('id', flat=True))
+        reviewed_title_ids = set(Review.objects.filter(
+            author=author, title_id__in=existing_title_ids
+        ).values_list('title_id', flat=True))
+        reviews = {}
+        for index, item in items.items():
+            if item['title_id'] not in existing_title_ids:
+                results[index] = self.get_error(
+                    index, {'title_id': ['Произведение не найдено.']}
                 )
-        return data
+            elif item['title_id'] in reviewed_title_ids:
+                results[index] = self.get_error(index, {
+                    'non_field_errors': [
+                        'Вы уже оставили отзыв на это произведение.'
+                    ]
+                })
+            else:
+                reviewed_title_ids.add(item['title_id'])
+                reviews[index] = Review(author=author, **item)
+        if not reviews:
+            return results
+
+        created_title_ids = [review.title_id for review in reviews.values()]
+        try:
+            with transaction.atomic():
+                Review.objects.bulk_create(reviews.values())
+                review_ids = dict(Review.objects.filter(
+                    author=author, title_id__in=created_title_ids
+                ).values_list('title_id', 'id'))
+                Title.objects.filter(
+                    id__in=created_title_ids
+                ).refresh_ratings()
+                TitleScoreCount.objects.refresh(created_title_ids)
+                TitleRanking.objects.refresh(created_title_ids)
+        except IntegrityError:
+            raise serializers.ValidationError(
+                'Вы уже оставили отзыв на это произведение.'
+            )
+        bump_versions('reviews', 'titles')
+        for index, review in reviews.items():
+            results[index] = {
+                'index': index,
+                'status': status.HTTP_201_CREATED,
+                'id': review_ids[review.title_id],
+            }
+        return results
+
+    def get_error(self, index, errors):
+        return {
+            'index': index,
+            'status': status.HTTP_400_BAD_REQUEST,
+            'errors': errors,
+        }
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -134,13 +246,18 @@ class TitleReadSerializer(serializers.ModelSerializer):
         read_only=True,
         many=True
     )
-    rating = serializers.IntegerField(
-        read_only=True,
-        default=0
-    )
 
     class Meta:
-        fields = '__all__'
+        fields = (
+            'id',
+            'name',
+            'year',
+            'rating',
+            'description',
+            'genre',
+            'category'
+        )
+        read_only_fields = ('rating',)
         model = Title
 
 
@@ -156,13 +273,47 @@ class TitlePostSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = '__all__'
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
         model = Title
 
     def to_representation(self, instance):
         return TitleReadSerializer(instance).data
 
 
+class TitleStatsSerializer(serializers.BaseSerializer):
+
+    def to_representation(self, instance):
+        distribution = get_score_distribution(instance.score_counts.all())
+        return {
+            'id': instance.id,
+            'count': sum(distribution.values()),
+            'mean': get_score_mean(distribution),
+            'median': get_score_percentile(distribution, 50),
+            'percentiles': {
+                str(percent): get_score_percentile(distribution, percent)
+                for percent in STATS_PERCENTILES
+            },
+            'distribution': {
+                str(score): count for score, count in distribution.items()
+            },
+        }
+
+
+class RankingQuerySerializer(serializers.Serializer):
+    category = serializers.SlugField(required=False)
+    genre = serializers.SlugField(required=False)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=RANKING_MAX_SIZE, default=RANKING_SIZE
+    )
+
+    def validate(self, data):
+        if 'category' in data and 'genre' in data:
+            raise serializers.ValidationError(
+                'Укажите либо категорию, либо жанр.'
+            )
+        return data
+
+
 class CommentSerializer(serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         slug_field='username',
@@ -0,0 +1,44 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.v1.authentication import user_cache
+from api.v1.cache import bump_versions
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+CACHE_RESOURCES = {
+    Category: ('categories', 'titles', 'title_index'),
+    Genre: ('genres', 'titles', 'title_index'),
+    Title: ('titles', 'title_index'),
+    Review: ('reviews', 'titles'),
+    Comment: ('comments',),
+}
+
+
+def bump_versions_on_commit(*resources, using=None):
+    transaction.on_commit(lambda: bump_versions(*resources), using=using)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_cache_versions(sender, using=None, **kwargs):
+    if sender in CACHE_RESOURCES:
+        bump_versions_on_commit(*CACHE_RESOURCES[sender], using=using)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def bump_title_genre_versions(sender, action, using=None, **kwargs):
+    if action.startswith('post_'):
+        bump_versions_on_commit('titles', 'title_index', using=using)
+
+
+@receiver(post_save, sender=User)
+def bump_author_versions(sender, created, using=None, **kwargs):
+    if not created:
+        bump_versions_on_commit('reviews', 'comments', using=using)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_snapshot(sender, instance, **kwargs):
+    user_cache.invalidate_user(instance.pk)
@@ -2,8 +2,8 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from api.v1.views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                          ReviewViewSet, TitleViewSet, UserViewSet, singup,
-                          token)
+                          ReviewViewSet, TitleViewSet, UserViewSet,
+                          bulk_reviews, singup, token)
 
 v1_router = DefaultRouter()
 
@@ -45,5 +45,6 @@ auth_urls = [
 
 urlpatterns = [
     path('auth/', include(auth_urls)),
+    path('reviews/bulk/', bulk_reviews, name='bulk_reviews'),
     path('', include(v1_router.urls)),
 ]
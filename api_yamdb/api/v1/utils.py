@@ -0,0 +1,38 @@
+import math
+
+from api.v1.constants import MAX_SCORE, MIN_SCORE
+
+
+def get_score_distribution(score_counts):
+    distribution = dict.fromkeys(range(MIN_SCORE, MAX_SCORE + 1), 0)
+    for score_count in score_counts:
+        distribution[score_count.score] += score_count.count
+    return distribution
+
+
+def get_score_at(distribution, position):
+    seen = 0
+    for score, count in distribution.items():
+        seen += count
+        if position < seen:
+            return score
+    raise IndexError(position)
+
+
+def get_score_percentile(distribution, percent):
+    total = sum(distribution.values())
+    if not total:
+        return None
+    position = (total - 1) * percent / 100
+    lower = get_score_at(distribution, math.floor(position))
+    upper = get_score_at(distribution, math.ceil(position))
+    return lower + (upper - lower) * (position - math.floor(position))
+
+
+def get_score_mean(distribution):
+    total = sum(distribution.values())
+    if not total:
+        return None
+    return sum(
+        score * count for score, count in distribution.items()
+    ) / total
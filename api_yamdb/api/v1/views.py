@@ -1,24 +1,42 @@
-from django.db.models import Avg
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import prefetch_related_objects
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, permissions, status, viewsets
-from rest_framework.decorators import action, api_view
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from api.v1.filters import TitleFilter
+from api.v1.bitmaps import title_index
+from api.v1.cache import get_facets_cache_key, get_version
+from api.v1.constants import (DEFAULT_EXPORT_TYPE, EXPORT_TYPE_PARAM,
+                              FACETS_PARAM, RESPONSE_CACHE_TIMEOUT,
+                              TITLE_FACETS)
+from api.v1.exports import EXPORTERS
+from api.v1.facets import get_title_facets
+from api.v1.filters import TitleFilter, TitleSearchFilter
+from api.v1.mixins import (CachedListMixin, CachedResponseMixin,
+                           ProfiledViewMixin, StreamingListMixin)
+from api.v1.pagination import PublishedContentPagination, TitlePagination
 from api.v1.permissions import IsOwnerOrStaff, IsSuperUserOrAdmin, UserAdmin
-from api.v1.serializers import (CategorySerializer, CommentSerializer,
-                                GenreSerializer, ReviewSerializer,
-                                SingupSerializer, TitleReadSerializer,
-                                TitlePostSerializer, TokenSerializer,
-                                UserSerializer)
-from reviews.models import Category, Genre, Review, Title, User
+from api.v1.serializers import (BulkReviewSerializer, CategorySerializer,
+                                CommentSerializer, GenreSerializer,
+                                RankingQuerySerializer, ReviewSerializer,
+                                SingupSerializer, TitlePostSerializer,
+                                TitleReadSerializer, TitleStatsSerializer,
+                                TokenSerializer, UserSerializer)
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleRanking, User)
 
 
 class BaseCategoryGenreViewSet(
+    ProfiledViewMixin,
+    CachedListMixin,
     viewsets.GenericViewSet,
     viewsets.mixins.ListModelMixin,
     viewsets.mixins.CreateModelMixin,
@@ -37,26 +55,37 @@ class BaseCategoryGenreViewSet(
         return super().get_serializer_class()
 
 
-class BaseCommentReviewViewSet(viewsets.ModelViewSet):
-    pagination_class = PageNumberPagination
+class BaseCommentReviewViewSet(
+    ProfiledViewMixin,
+    StreamingListMixin,
+    CachedResponseMixin,
+    viewsets.ModelViewSet
+):
+    pagination_class = PublishedContentPagination
     http_method_names = ['post', 'get', 'patch', 'delete']
     permission_classes = [
         permissions.IsAuthenticatedOrReadOnly,
         IsOwnerOrStaff
     ]
 
-    def get_review_or_title(self, model, **kwargs):
-        return get_object_or_404(model, **kwargs)
+    @cached_property
+    def title(self):
+        return get_object_or_404(Title, id=self.kwargs.get('title_id'))
 
-    def get_review(self):
-        review_id = self.kwargs.get('review_id')
-        title_id = self.kwargs.get('title_id')
-        return self.get_review_or_title(
+    @cached_property
+    def review(self):
+        return get_object_or_404(
             Review,
-            id=review_id,
-            title_id=title_id
+            id=self.kwargs.get('review_id'),
+            title_id=self.kwargs.get('title_id')
         )
 
+    def get_title(self):
+        return self.title
+
+    def get_review(self):
+        return self.review
+
 
 @api_view(['POST'])
 def singup(request):
@@ -86,7 +115,26 @@ def token(request):
     )
 
 
-class UserViewSet(viewsets.ModelViewSet):
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_reviews(request):
+
+    serializer = BulkReviewSerializer(
+        data=request.data, context={'request': request}
+    )
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+    return Response(
+        serializer.data,
+        status=status.HTTP_200_OK
+    )
+
+
+class UserViewSet(
+    ProfiledViewMixin,
+    StreamingListMixin,
+    viewsets.ModelViewSet
+):
 
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -108,7 +156,7 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer_class=UserSerializer,
     )
     def get_edit_user(self, request):
-        user = request.user
+        user = get_object_or_404(User, pk=request.user.pk)
         serializer = self.get_serializer(user)
         if request.method == 'PATCH':
             serializer = self.get_serializer(
@@ -121,12 +169,16 @@ class UserViewSet(viewsets.ModelViewSet):
 
 class ReviewViewSet(BaseCommentReviewViewSet):
     serializer_class = ReviewSerializer
-
-    def get_title(self):
-        return self.get_review_or_title(Title, id=self.kwargs.get('title_id'))
+    cache_resource = 'reviews'
 
     def get_queryset(self):
-        return self.get_title().reviews.all().order_by('-pub_date')
+        if self.detail:
+            reviews = Review.objects.filter(
+                title_id=self.kwargs.get('title_id')
+            )
+        else:
+            reviews = self.get_title().reviews.all()
+        return reviews.select_related('author').order_by('-pub_date')
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, title=self.get_title())
@@ -134,20 +186,29 @@ class ReviewViewSet(BaseCommentReviewViewSet):
 
 class CategoryViewSet(BaseCategoryGenreViewSet):
     queryset = Category.objects.all().order_by('name')
+    cache_resource = 'categories'
     search_fields = ['name', 'slug']
 
 
 class GenreViewSet(BaseCategoryGenreViewSet):
     queryset = Genre.objects.all().order_by('name')
+    cache_resource = 'genres'
     search_fields = ['name']
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).order_by('name')
+class TitleViewSet(
+    ProfiledViewMixin,
+    StreamingListMixin,
+    CachedResponseMixin,
+    viewsets.ModelViewSet
+):
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre').order_by('name')
     permission_classes = (IsSuperUserOrAdmin,)
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+    pagination_class = TitlePagination
+    cache_resource = 'titles'
+    filter_backends = [DjangoFilterBackend, TitleSearchFilter]
     filterset_class = TitleFilter
     http_method_names = [
         'post',
@@ -156,17 +217,160 @@ class TitleViewSet(viewsets.ModelViewSet):
         'delete'
     ]
 
+    def get_queryset(self):
+        if self.action == 'stats':
+            return Title.objects.all()
+        return super().get_queryset()
+
     def get_serializer_class(self):
-        if self.action in ('list', 'retrieve'):
+        if self.action in ('list', 'retrieve', 'top', 'trending'):
             return TitleReadSerializer
+        if self.action == 'stats':
+            return TitleStatsSerializer
         return TitlePostSerializer
 
+    def paginate_queryset(self, queryset):
+        titles = self.get_bitmap_titles()
+        return super().paginate_queryset(
+            queryset if titles is None else titles
+        )
+
+    def get_bitmap_titles(self):
+        request = self.request
+        if (
+            not getattr(settings, 'TITLE_BITMAP_INDEX', False)
+            or self.paginator.is_cursor_request(request)
+            or request.query_params.get(
+                TitleSearchFilter.search_param, ''
+            ).strip()
+        ):
+            return None
+        queryset = self.get_queryset()
+        filterset = self.filterset_class(
+            request.query_params, queryset=queryset, request=request
+        )
+        if not filterset.is_valid() or filterset.form.cleaned_data['name']:
+            return None
+        return title_index.filter(
+            queryset,
+            genre=filterset.form.cleaned_data['genre'],
+            category=filterset.form.cleaned_data['category'],
+            year=filterset.form.cleaned_data['year']
+        )
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        facets = self.get_facet_names()
+        if facets:
+            response.data['facets'] = self.get_facets(facets)
+        return response
+
+    def get_facet_names(self):
+        value = self.request.query_params.get(FACETS_PARAM, '')
+        facets = [name.strip() for name in value.split(',') if name.strip()]
+        if not set(facets) <= set(TITLE_FACETS):
+            raise ValidationError({FACETS_PARAM: [
+                'Допустимые значения: ' + ', '.join(TITLE_FACETS) + '.'
+            ]})
+        return list(dict.fromkeys(facets))
+
+    def is_filtered(self):
+        params = self.request.query_params
+        return any(
+            params.get(name, '').strip() for name in (
+                *self.filterset_class.base_filters,
+                TitleSearchFilter.search_param
+            )
+        )
+
+    def get_facets(self, facets):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.is_filtered():
+            return get_title_facets(queryset, facets)
+        version, _ = get_version('title_index')
+        key = get_facets_cache_key('title_index', version)
+        catalog = cache.get(key)
+        if catalog is None:
+            catalog = get_title_facets(queryset, TITLE_FACETS)
+            cache.set(key, catalog, RESPONSE_CACHE_TIMEOUT)
+        return {name: catalog[name] for name in facets}
+
+    @action(methods=['get'], detail=True, url_path='stats')
+    def stats(self, request, pk=None):
+        serializer = self.get_serializer(self.get_object())
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(methods=['get'], detail=False, url_path='top')
+    def top(self, request):
+        return self.get_cached_response(
+            self.get_ranking, request, TitleRanking.objects.top()
+        )
+
+    @action(methods=['get'], detail=False, url_path='trending')
+    def trending(self, request):
+        return self.get_cached_response(
+            self.get_ranking, request, TitleRanking.objects.trending()
+        )
+
+    def get_ranking(self, request, rankings):
+        query = RankingQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        if 'category' in params:
+            rankings = rankings.for_category(params['category'])
+        elif 'genre' in params:
+            rankings = rankings.for_genre(params['genre'])
+        else:
+            rankings = rankings.overall()
+        titles = [
+            ranking.title for ranking in rankings.select_related(
+                'title__category'
+            )[:params['limit']]
+        ]
+        prefetch_related_objects(titles, 'genre')
+        serializer = self.get_serializer(titles, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(
+        methods=['get'],
+        detail=False,
+        url_path='export',
+        permission_classes=(UserAdmin,)
+    )
+    def export(self, request):
+        export_type = request.query_params.get(
+            EXPORT_TYPE_PARAM, DEFAULT_EXPORT_TYPE
+        )
+        if export_type not in EXPORTERS:
+            return Response(
+                {EXPORT_TYPE_PARAM: [
+                    'Допустимые значения: ' + ', '.join(EXPORTERS) + '.'
+                ]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        exporter, content_type = EXPORTERS[export_type]
+        response = StreamingHttpResponse(
+            exporter(), content_type=content_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="titles.{export_type}"'
+        )
+        return response
+
 
 class CommentViewSet(BaseCommentReviewViewSet):
     serializer_class = CommentSerializer
+    cache_resource = 'comments'
 
     def get_queryset(self):
-        return self.get_review().comments.all().order_by('-pub_date')
+        if self.detail:
+            comments = Comment.objects.filter(
+                review_id=self.kwargs.get('review_id'),
+                review__title_id=self.kwargs.get('title_id')
+            )
+        else:
+            comments = self.get_review().comments.all()
+        return comments.select_related('author').order_by('-pub_date')
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, review=self.get_review())
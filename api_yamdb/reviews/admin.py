@@ -1,7 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.models import (Category, Comment, Genre, OutgoingEmail, Review,
+                            Title, User)
 
 
 class UserAdmin(BaseUserAdmin):
@@ -47,8 +48,11 @@ class GenreAdmin(admin.ModelAdmin):
 
 @admin.register(Title)
 class TitleAdmin(admin.ModelAdmin):
-    list_display = ('name', 'year', 'category', 'get_genres', 'description')
+    list_display = (
+        'name', 'year', 'category', 'get_genres', 'rating', 'description'
+    )
     list_filter = ('year', 'category', 'genre')
+    readonly_fields = ('rating', 'review_count', 'score_sum')
     search_fields = ('name', 'category__name', 'genre__name')
     autocomplete_fields = ('category',)
     filter_horizontal = ('genre',)
@@ -74,4 +78,13 @@ class CommentAdmin(admin.ModelAdmin):
     search_fields = ('review__text', 'author__username', 'text')
 
 
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ('id', 'recipient', 'subject', 'status', 'attempts',
+                    'created', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('recipient',)
+    readonly_fields = ('claim',)
+
+
 admin.site.register(User, UserAdmin)
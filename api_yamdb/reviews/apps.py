@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ReviewsConfig(AppConfig):
+    name = 'reviews'
+    default_auto_field = 'django.db.models.BigAutoField'
+
+    def ready(self):
+        import reviews.signals  # noqa: F401
@@ -7,3 +7,43 @@ TITLES_CSV = 'titles.csv'
 GENRE_TITLE_CSV = 'genre_title.csv'
 REVIEW_CSV = 'review.csv'
 COMMENTS_CSV = 'comments.csv'
+
+IMPORT_BATCH_SIZE = 1000
+IMPORT_CHECKPOINT_FILE = 'import_csv.checkpoint.json'
+
+TITLE_SEARCH_TABLE = 'reviews_title_fts'
+TITLE_SEARCH_CONFIG = 'simple'
+
+RANKING_TRENDING_DAYS = 7
+RANKING_BATCH_SIZE = 1000
+
+EMAIL_SUBJECT_MAX_LENGTH = 255
+EMAIL_STATUS_MAX_LENGTH = 16
+EMAIL_BATCH_SIZE = 100
+EMAIL_WORKERS = 4
+EMAIL_MAX_ATTEMPTS = 5
+EMAIL_RETRY_DELAY = 30
+EMAIL_SENDING_TIMEOUT = 300
+EMAIL_TIMEOUT_ERROR = 'Sending timed out'
+EMAIL_POLL_INTERVAL = 5
+
+FAKE_DATA_PREFIX = 'fake'
+FAKE_DATA_USERS = 1000
+FAKE_DATA_CATEGORIES = 10
+FAKE_DATA_GENRES = 30
+FAKE_DATA_GENRES_PER_TITLE = 2
+FAKE_DATA_TITLES = 10000
+FAKE_DATA_REVIEWS = 100000
+FAKE_DATA_COMMENTS = 200000
+FAKE_DATA_SKEW = 1.0
+FAKE_DATA_SEED = 42
+FAKE_DATA_BATCH_SIZE = 5000
+FAKE_DATA_MIN_YEAR = 1900
+FAKE_DATA_MAX_YEAR = 2020
+FAKE_DATA_WORDS = (
+    'время', 'жизнь', 'мир', 'город', 'дорога', 'ночь', 'свет', 'тень',
+    'война', 'любовь', 'история', 'песня', 'море', 'небо', 'дом', 'друг',
+    'сердце', 'звезда', 'игра', 'тайна', 'лето', 'зима', 'река', 'сон',
+    'герой', 'путь', 'огонь', 'ветер', 'память', 'правда', 'последний',
+    'первый', 'долгий', 'тихий', 'старый', 'новый', 'красный', 'белый',
+)
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from api.v1.constants import DEFAULT_EXPORT_TYPE, EXPORT_CHUNK_SIZE
+from api.v1.exports import EXPORTERS
+
+
+class Command(BaseCommand):
+    help = 'Stream all titles with category, genres and rating'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type',
+            choices=EXPORTERS,
+            default=DEFAULT_EXPORT_TYPE,
+            help='Output format.'
+        )
+        parser.add_argument(
+            '--output',
+            help='File to write to, stdout by default.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help='Number of titles fetched per database round trip.'
+        )
+
+    def handle(self, *args, **options):
+        exporter, _ = EXPORTERS[options['type']]
+        chunks = exporter(options['chunk_size'])
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        with open(
+            options['output'], 'w', encoding='utf-8', newline=''
+        ) as file:
+            for chunk in chunks:
+                file.write(chunk)
@@ -0,0 +1,369 @@
+import os
+import random
+import time
+from collections import Counter
+from contextlib import nullcontext
+from itertools import accumulate
+from multiprocessing import Lock, Pool
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Max
+
+from api.v1.cache import bump_versions
+from api.v1.constants import MAX_SCORE, MIN_SCORE
+from reviews.constants import (FAKE_DATA_BATCH_SIZE, FAKE_DATA_CATEGORIES,
+                               FAKE_DATA_COMMENTS, FAKE_DATA_GENRES,
+                               FAKE_DATA_GENRES_PER_TITLE, FAKE_DATA_MAX_YEAR,
+                               FAKE_DATA_MIN_YEAR, FAKE_DATA_PREFIX,
+                               FAKE_DATA_REVIEWS, FAKE_DATA_SEED,
+                               FAKE_DATA_SKEW, FAKE_DATA_TITLES,
+                               FAKE_DATA_USERS, FAKE_DATA_WORDS)
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleRanking, TitleScoreCount, User)
+
+GenreTitle = Title.genre.through
+
+plan = None
+write_lock = None
+
+
+def get_zipf_counts(total, size, skew, rng, cap=None):
+    """Split `total` into `size` Zipf-distributed counts in random order.
+
+    With `cap`, counts above it are carried over to the next ranks, so the
+    total is kept unless every count hits the cap.
+    """
+    if not size:
+        return []
+    weights = [1 / rank ** skew for rank in range(1, size + 1)]
+    scale = total / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    for index in range(total - sum(counts)):
+        counts[index % size] += 1
+    if cap is not None:
+        carry = 0
+        for index, count in enumerate(counts):
+            count += carry
+            counts[index] = min(count, cap)
+            carry = count - counts[index]
+    rng.shuffle(counts)
+    return counts
+
+
+def get_offsets(counts):
+    return [0, *accumulate(counts)]
+
+
+def get_shards(counts, size):
+    start, rows = 0, 0
+    for index, count in enumerate(counts):
+        rows += count
+        if rows >= size:
+            yield start, index + 1
+            start, rows = index + 1, 0
+    if start < len(counts):
+        yield start, len(counts)
+
+
+def get_text(rng, min_words, max_words):
+    return ' '.join(
+        rng.choices(FAKE_DATA_WORDS, k=rng.randint(min_words, max_words))
+    ).capitalize()
+
+
+def build_users(rng, start, stop):
+    users = []
+    for index in range(start, stop):
+        user_id = plan['user_base'] + index
+        users.append(User(
+            id=user_id,
+            username=f'{plan["prefix"]}{user_id}',
+            email=f'{plan["prefix"]}{user_id}@yamdb.fake',
+        ))
+    return users
+
+
+def build_titles(rng, start, stop):
+    return [
+        Title(
+            id=plan['title_base'] + index,
+            name=get_text(rng, 1, 4),
+            year=rng.randint(FAKE_DATA_MIN_YEAR, FAKE_DATA_MAX_YEAR),
+            description=get_text(rng, 5, 30),
+            category_id=rng.choice(plan['category_ids']),
+        )
+        for index in range(start, stop)
+    ]
+
+
+def build_genre_titles(rng, start, stop):
+    genre_ids = plan['genre_ids']
+    per_title = plan['genres_per_title']
+    return [
+        GenreTitle(
+            id=plan['genre_title_base'] + index * per_title + position,
+            title_id=plan['title_base'] + index,
+            genre_id=genre_id,
+        )
+        for index in range(start, stop)
+        for position, genre_id in enumerate(rng.sample(
+            genre_ids, min(per_title, len(genre_ids))
+        ))
+    ]
+
+
+def build_reviews(rng, start, stop):
+    reviews = []
+    for index in range(start, stop):
+        offset = plan['review_offsets'][index]
+        count = plan['review_counts'][index]
+        quality = rng.uniform(MIN_SCORE, MAX_SCORE)
+        authors = rng.sample(range(plan['users']), count)
+        for position, author in enumerate(authors):
+            score = round(rng.gauss(quality, 2))
+            reviews.append(Review(
+                id=plan['review_base'] + offset + position,
+                title_id=plan['title_base'] + index,
+                author_id=plan['user_base'] + author,
+                text=get_text(rng, 5, 40),
+                score=min(max(score, MIN_SCORE), MAX_SCORE),
+            ))
+    return reviews
+
+
+def build_comments(rng, start, stop):
+    comments = []
+    for index in range(start, stop):
+        offset = plan['comment_offsets'][index]
+        for position in range(plan['comment_counts'][index]):
+            comments.append(Comment(
+                id=plan['comment_base'] + offset + position,
+                review_id=plan['review_base'] + index,
+                author_id=plan['user_base'] + rng.randrange(plan['users']),
+                text=get_text(rng, 3, 20),
+            ))
+    return comments
+
+
+BUILDERS = {
+    'users': (User, build_users),
+    'titles': (Title, build_titles),
+    'genre_titles': (GenreTitle, build_genre_titles),
+    'reviews': (Review, build_reviews),
+    'comments': (Comment, build_comments),
+}
+
+
+def init_worker(worker_plan, lock=None):
+    global plan, write_lock
+    if not apps.ready:
+        django.setup()
+    plan, write_lock = worker_plan, lock
+
+
+def insert_shard(task):
+    kind, start, stop = task
+    model, build = BUILDERS[kind]
+    rng = random.Random(f'{plan["seed"]}:{kind}:{start}')
+    objects = build(rng, start, stop)
+    with write_lock or nullcontext(), transaction.atomic():
+        model.objects.bulk_create(objects, batch_size=plan['batch_size'])
+    return kind, len(objects)
+
+
+class Command(BaseCommand):
+    help = 'Generate a reproducible synthetic dataset for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=FAKE_DATA_USERS)
+        parser.add_argument(
+            '--categories', type=int, default=FAKE_DATA_CATEGORIES
+        )
+        parser.add_argument('--genres', type=int, default=FAKE_DATA_GENRES)
+        parser.add_argument(
+            '--genres-per-title',
+            type=int,
+            default=FAKE_DATA_GENRES_PER_TITLE
+        )
+        parser.add_argument('--titles', type=int, default=FAKE_DATA_TITLES)
+        parser.add_argument('--reviews', type=int, default=FAKE_DATA_REVIEWS)
+        parser.add_argument(
+            '--comments', type=int, default=FAKE_DATA_COMMENTS
+        )
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=FAKE_DATA_SKEW,
+            help=(
+                'Zipf exponent of reviews per title and comments per '
+                'review, 0 for a uniform spread.'
+            )
+        )
+        parser.add_argument('--seed', type=int, default=FAKE_DATA_SEED)
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help=(
+                'Number of processes building and inserting rows. SQLite '
+                'has a single writer, so there only building is parallel.'
+            )
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=FAKE_DATA_BATCH_SIZE,
+            help='Approximate number of rows inserted per transaction.'
+        )
+        parser.add_argument(
+            '--prefix',
+            default=FAKE_DATA_PREFIX,
+            help='Prefix of generated usernames, categories and genres.'
+        )
+
+    def handle(self, *args, **options):
+        if options['reviews'] and not (options['titles'] and options['users']):
+            raise CommandError('Reviews need at least one title and user.')
+        if options['comments'] and not options['reviews']:
+            raise CommandError('Comments need at least one review.')
+        if options['titles'] and not options['categories']:
+            raise CommandError('Titles need at least one category.')
+        started = time.monotonic()
+        worker_plan = self.get_plan(options)
+        tasks = self.get_tasks(worker_plan)
+        workers = options['workers']
+        lock = None
+        if connection.vendor == 'sqlite':
+            if connection.is_in_memory_db():
+                workers = 1
+            lock = Lock()
+        if workers > 1:
+            connections.close_all()
+            with Pool(
+                workers,
+                initializer=init_worker,
+                initargs=(worker_plan, lock)
+            ) as pool:
+                totals = self.run(pool.imap_unordered, tasks)
+        else:
+            init_worker(worker_plan)
+            totals = self.run(map, tasks)
+
+        with transaction.atomic():
+            Title.objects.refresh_ratings()
+            TitleScoreCount.objects.refresh()
+            TitleRanking.objects.refresh()
+        self.reset_sequences(User, Category, Genre, Title, Review, Comment)
+        bump_versions(
+            'categories', 'genres', 'titles', 'title_index', 'reviews',
+            'comments'
+        )
+        elapsed = time.monotonic() - started
+        for kind in BUILDERS:
+            self.stdout.write(f'{kind}: {totals[kind]} rows')
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Generated {sum(totals.values())} rows in {elapsed:.2f}s '
+                f'with {workers} worker(s)'
+            )
+        )
+
+    def get_next_id(self, model):
+        return (model.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+
+    def get_plan(self, options):
+        rng = random.Random(f'{options["seed"]}:plan')
+        prefix = options['prefix']
+        with transaction.atomic():
+            category_base = self.get_next_id(Category)
+            Category.objects.bulk_create(
+                Category(
+                    id=category_base + index,
+                    name=f'Категория {category_base + index}',
+                    slug=f'{prefix}-category-{category_base + index}',
+                )
+                for index in range(options['categories'])
+            )
+            genre_base = self.get_next_id(Genre)
+            Genre.objects.bulk_create(
+                Genre(
+                    id=genre_base + index,
+                    name=f'Жанр {genre_base + index}',
+                    slug=f'{prefix}-genre-{genre_base + index}',
+                )
+                for index in range(options['genres'])
+            )
+        review_counts = get_zipf_counts(
+            options['reviews'], options['titles'], options['skew'], rng,
+            cap=options['users']
+        )
+        comment_counts = get_zipf_counts(
+            options['comments'], sum(review_counts), options['skew'], rng
+        )
+        return {
+            'seed': options['seed'],
+            'prefix': prefix,
+            'batch_size': options['batch_size'],
+            'users': options['users'],
+            'titles': options['titles'],
+            'genres_per_title': options['genres_per_title'],
+            'category_ids': list(range(
+                category_base, category_base + options['categories']
+            )),
+            'genre_ids': list(range(
+                genre_base, genre_base + options['genres']
+            )),
+            'user_base': self.get_next_id(User),
+            'title_base': self.get_next_id(Title),
+            'genre_title_base': self.get_next_id(GenreTitle),
+            'review_base': self.get_next_id(Review),
+            'comment_base': self.get_next_id(Comment),
+            'review_counts': review_counts,
+            'review_offsets': get_offsets(review_counts),
+            'comment_counts': comment_counts,
+            'comment_offsets': get_offsets(comment_counts),
+        }
+
+    def get_tasks(self, worker_plan):
+        size = worker_plan['batch_size']
+        per_title = [1] * worker_plan['titles']
+        return (
+            [
+                *(('users', start, stop) for start, stop in get_shards(
+                    [1] * worker_plan['users'], size
+                )),
+                *(('titles', start, stop) for start, stop in get_shards(
+                    per_title, size
+                )),
+            ],
+            [
+                *(('genre_titles', start, stop) for start, stop in get_shards(
+                    per_title, size // max(worker_plan['genres_per_title'], 1)
+                )),
+                *(('reviews', start, stop) for start, stop in get_shards(
+                    worker_plan['review_counts'], size
+                )),
+            ],
+            [
+                ('comments', start, stop) for start, stop in get_shards(
+                    worker_plan['comment_counts'], size
+                )
+            ],
+        )
+
+    def run(self, map_shards, tasks):
+        totals = Counter()
+        for phase in tasks:
+            for kind, rows in map_shards(insert_shard, phase):
+                totals[kind] += rows
+        return totals
+
+    def reset_sequences(self, *models):
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
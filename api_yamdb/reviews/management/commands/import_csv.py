@@ -1,105 +1,257 @@
 import csv
+import json
 import os
+import time
+from itertools import islice
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
 
+from api.v1.cache import bump_versions
 from reviews.constants import (CATEGORY_CSV, COMMENTS_CSV, CSV_FILES_PATH,
-                               GENRE_CSV, GENRE_TITLE_CSV, REVIEW_CSV,
-                               TITLES_CSV, USERS_CSV)
-from reviews.models import Category, Comment, Genre, Review, Title, User
+                               GENRE_CSV, GENRE_TITLE_CSV, IMPORT_BATCH_SIZE,
+                               IMPORT_CHECKPOINT_FILE, REVIEW_CSV, TITLES_CSV,
+                               USERS_CSV)
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleRanking, TitleScoreCount, User)
+
+GenreTitle = Title.genre.through
+
+
+def read_lines(file):
+    for line in iter(file.readline, b''):
+        yield line.decode('utf-8')
 
 
 class Command(BaseCommand):
     help = 'Import data from csv files'
 
-    def handle(self, *args, **kwargs):
-        with open(
-            os.path.join(CSV_FILES_PATH, USERS_CSV), encoding='utf-8'
-        ) as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                User.objects.get_or_create(
-                    id=row['id'],
-                    username=row['username'],
-                    email=row['email'],
-                    role=row['role'],
-                    bio=row['bio'],
-                    first_name=row['first_name'],
-                    last_name=row['last_name'],
-                )
-
-        with open(
-            os.path.join(CSV_FILES_PATH, CATEGORY_CSV), encoding='utf-8'
-        ) as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                Category.objects.get_or_create(
-                    name=row['name'],
-                    slug=row['slug'],
-                )
-
-        with open(
-            os.path.join(CSV_FILES_PATH, GENRE_CSV), encoding='utf-8'
-        ) as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                Genre.objects.get_or_create(
-                    name=row['name'],
-                    slug=row['slug'],
-                )
-
-        with open(
-            os.path.join(CSV_FILES_PATH, TITLES_CSV), encoding='utf-8'
-        ) as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                category = Category.objects.get(id=row['category'])
-                Title.objects.get_or_create(
-                    name=row['name'],
-                    year=row['year'],
-                    category=category,
-                )
-
-        with open(
-            os.path.join(CSV_FILES_PATH, GENRE_TITLE_CSV), encoding='utf-8'
-        ) as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                title = Title.objects.get(id=row['title_id'])
-                genre = Genre.objects.get(id=row['genre_id'])
-                title.genre.add(genre)
-
-        with open(
-            os.path.join(CSV_FILES_PATH, REVIEW_CSV), encoding='utf-8'
-        ) as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                title = Title.objects.get(id=row['title_id'])
-                author = User.objects.get(id=row['author'])
-                Review.objects.get_or_create(
-                    id=row['id'],
-                    title=title,
-                    text=row['text'],
-                    author=author,
-                    score=row['score'],
-                    pub_date=row['pub_date'],
-                )
-
-        with open(
-            os.path.join(CSV_FILES_PATH, COMMENTS_CSV), encoding='utf-8'
-        ) as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                review = Review.objects.get(id=row['review_id'])
-                author = User.objects.get(id=row['author'])
-                Comment.objects.get_or_create(
-                    id=row['id'],
-                    review=review,
-                    text=row['text'],
-                    author=author,
-                    pub_date=row['pub_date'],
-                )
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=CSV_FILES_PATH,
+            help='Directory with the csv files.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Number of rows read, inserted and committed per chunk.'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            default=IMPORT_CHECKPOINT_FILE,
+            help='File that records the last committed chunk.'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue from the last checkpoint.'
+        )
+
+    def handle(self, *args, **options):
+        self.path = options['path']
+        self.batch_size = options['batch_size']
+        self.checkpoint = options['checkpoint']
+        files = (
+            (USERS_CSV, User, self.build_users),
+            (CATEGORY_CSV, Category, self.build_core(Category)),
+            (GENRE_CSV, Genre, self.build_core(Genre)),
+            (TITLES_CSV, Title, self.build_titles),
+            (GENRE_TITLE_CSV, GenreTitle, self.build_genre_titles),
+            (REVIEW_CSV, Review, self.build_reviews),
+            (COMMENTS_CSV, Comment, self.build_comments),
+        )
+        filenames = [filename for filename, _, _ in files]
+        start, offset = 0, 0
+        if options['resume']:
+            start, offset = self.load_checkpoint(filenames)
+        for filename, model, build in files[start:]:
+            self.import_file(filename, model, build, offset)
+            offset = 0
 
+        with transaction.atomic():
+            Title.objects.refresh_ratings()
+            TitleScoreCount.objects.refresh()
+            TitleRanking.objects.refresh()
+        self.reset_sequences(User, Category, Genre, Title, Review, Comment)
+        bump_versions(
+            'categories', 'genres', 'titles', 'title_index', 'reviews',
+            'comments'
+        )
+        if os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
         self.stdout.write(
             self.style.SUCCESS('Successfully imported')
         )
+
+    def load_checkpoint(self, filenames):
+        try:
+            with open(self.checkpoint, encoding='utf-8') as file:
+                checkpoint = json.load(file)
+        except FileNotFoundError:
+            raise CommandError(f'Checkpoint {self.checkpoint} not found.')
+        if checkpoint['file'] not in filenames:
+            raise CommandError(
+                f'Unknown file {checkpoint["file"]} in checkpoint.'
+            )
+        self.stdout.write(
+            f'Resuming {checkpoint["file"]} after id {checkpoint["last_id"]}'
+        )
+        return filenames.index(checkpoint['file']), checkpoint['offset']
+
+    def save_checkpoint(self, filename, offset, last_id):
+        temporary = f'{self.checkpoint}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(
+                {'file': filename, 'offset': offset, 'last_id': last_id},
+                file
+            )
+        os.replace(temporary, self.checkpoint)
+
+    def import_file(self, filename, model, build, offset=0):
+        started = time.monotonic()
+        rows = 0
+        with open(os.path.join(self.path, filename), 'rb') as file:
+            reader = csv.reader(read_lines(file))
+            fieldnames = next(reader)
+            if offset:
+                file.seek(offset)
+            while True:
+                chunk = [
+                    dict(zip(fieldnames, row))
+                    for row in islice(reader, self.batch_size)
+                ]
+                if not chunk:
+                    break
+                with transaction.atomic():
+                    model.objects.bulk_create(
+                        build(chunk), ignore_conflicts=True
+                    )
+                rows += len(chunk)
+                self.save_checkpoint(filename, file.tell(), chunk[-1]['id'])
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f'{filename}: {rows} rows in {elapsed:.2f}s '
+            f'({rows / elapsed if elapsed else rows:.0f} rows/s)'
+        )
+
+    def get_existing_ids(self, model, ids):
+        return set(
+            model.objects.filter(id__in=ids).values_list('id', flat=True)
+        )
+
+    def skip(self, filename, row):
+        self.stderr.write(
+            f'{filename}: skipped row {row["id"]} with unknown references'
+        )
+
+    def build_users(self, chunk):
+        return [
+            User(
+                id=row['id'],
+                username=row['username'],
+                email=row['email'],
+                role=row['role'],
+                bio=row['bio'],
+                first_name=row['first_name'],
+                last_name=row['last_name'],
+            )
+            for row in chunk
+        ]
+
+    def build_core(self, model):
+        def build(chunk):
+            return [
+                model(id=row['id'], name=row['name'], slug=row['slug'])
+                for row in chunk
+            ]
+        return build
+
+    def build_titles(self, chunk):
+        category_ids = self.get_existing_ids(
+            Category,
+            {int(row['category']) for row in chunk if row['category']}
+        )
+        titles = []
+        for row in chunk:
+            category_id = int(row['category']) if row['category'] else None
+            titles.append(Title(
+                id=row['id'],
+                name=row['name'],
+                year=row['year'],
+                category_id=(
+                    category_id if category_id in category_ids else None
+                ),
+            ))
+        return titles
+
+    def build_genre_titles(self, chunk):
+        title_ids = self.get_existing_ids(
+            Title, {int(row['title_id']) for row in chunk}
+        )
+        genre_ids = self.get_existing_ids(
+            Genre, {int(row['genre_id']) for row in chunk}
+        )
+        genre_titles = []
+        for row in chunk:
+            title_id, genre_id = int(row['title_id']), int(row['genre_id'])
+            if title_id not in title_ids or genre_id not in genre_ids:
+                self.skip(GENRE_TITLE_CSV, row)
+                continue
+            genre_titles.append(GenreTitle(
+                id=row['id'], title_id=title_id, genre_id=genre_id
+            ))
+        return genre_titles
+
+    def build_reviews(self, chunk):
+        title_ids = self.get_existing_ids(
+            Title, {int(row['title_id']) for row in chunk}
+        )
+        user_ids = self.get_existing_ids(
+            User, {int(row['author']) for row in chunk}
+        )
+        reviews = []
+        for row in chunk:
+            title_id, author_id = int(row['title_id']), int(row['author'])
+            if title_id not in title_ids or author_id not in user_ids:
+                self.skip(REVIEW_CSV, row)
+                continue
+            reviews.append(Review(
+                id=row['id'],
+                title_id=title_id,
+                text=row['text'],
+                author_id=author_id,
+                score=row['score'],
+                pub_date=row['pub_date'],
+            ))
+        return reviews
+
+    def build_comments(self, chunk):
+        review_ids = self.get_existing_ids(
+            Review, {int(row['review_id']) for row in chunk}
+        )
+        user_ids = self.get_existing_ids(
+            User, {int(row['author']) for row in chunk}
+        )
+        comments = []
+        for row in chunk:
+            review_id, author_id = int(row['review_id']), int(row['author'])
+            if review_id not in review_ids or author_id not in user_ids:
+                self.skip(COMMENTS_CSV, row)
+                continue
+            comments.append(Comment(
+                id=row['id'],
+                review_id=review_id,
+                text=row['text'],
+                author_id=author_id,
+                pub_date=row['pub_date'],
+            ))
+        return comments
+
+    def reset_sequences(self, *models):
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
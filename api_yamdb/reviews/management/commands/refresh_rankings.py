@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.v1.cache import bump_versions
+from reviews.models import TitleRanking
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the title rankings and recount reviews in the trending '
+        'window'
+    )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        rankings = TitleRanking.objects.refresh()
+        bump_versions('titles')
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Refreshed {len(rankings)} rankings in {elapsed:.2f}s'
+            )
+        )
@@ -0,0 +1,164 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from reviews.constants import (EMAIL_BATCH_SIZE, EMAIL_MAX_ATTEMPTS,
+                               EMAIL_POLL_INTERVAL, EMAIL_RETRY_DELAY,
+                               EMAIL_SENDING_TIMEOUT, EMAIL_TIMEOUT_ERROR,
+                               EMAIL_WORKERS)
+from reviews.models import OutgoingEmail
+
+
+def get_error_message(error):
+    return str(error) or repr(error)
+
+
+def send_group(emails):
+    results = []
+    try:
+        with get_connection() as connection:
+            for email in emails:
+                try:
+                    EmailMessage(
+                        subject=email.subject,
+                        body=email.message,
+                        from_email=email.from_email,
+                        to=[email.recipient],
+                        connection=connection
+                    ).send()
+                except Exception as error:
+                    results.append((email, get_error_message(error)))
+                else:
+                    results.append((email, None))
+    except Exception as error:
+        results.extend(
+            (email, get_error_message(error))
+            for email in emails[len(results):]
+        )
+    return results
+
+
+class Command(BaseCommand):
+    help = 'Send queued emails from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=EMAIL_BATCH_SIZE,
+            help='Number of emails claimed per batch.'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=EMAIL_WORKERS,
+            help='Number of threads, each with its own mail connection.'
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=EMAIL_MAX_ATTEMPTS,
+            help='Attempts before an email is marked as failed.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=EMAIL_POLL_INTERVAL,
+            help='Seconds to wait when the outbox is empty.'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once no email is ready to be sent.'
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.workers = options['workers']
+        self.max_attempts = options['max_attempts']
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while True:
+                emails = self.claim_batch()
+                if emails:
+                    self.send_batch(executor, emails)
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['interval'])
+
+    def release_stale(self, now):
+        """Count an attempt for emails whose worker died or hung while
+        sending them, and fail those that reached `--max-attempts`.
+        """
+        stale = OutgoingEmail.objects.filter(
+            status=OutgoingEmail.SENDING, next_attempt_at__lte=now
+        )
+        stale.filter(attempts__gte=self.max_attempts - 1).update(
+            status=OutgoingEmail.FAILED,
+            attempts=F('attempts') + 1,
+            claim=None,
+            last_error=EMAIL_TIMEOUT_ERROR
+        )
+        stale.update(
+            status=OutgoingEmail.PENDING,
+            attempts=F('attempts') + 1,
+            claim=None,
+            last_error=EMAIL_TIMEOUT_ERROR
+        )
+
+    def claim_batch(self):
+        now = timezone.now()
+        claim = uuid.uuid4()
+        self.release_stale(now)
+        ready = OutgoingEmail.objects.filter(
+            status=OutgoingEmail.PENDING, next_attempt_at__lte=now
+        )
+        ids = list(ready.values_list('id', flat=True)[:self.batch_size])
+        ready.filter(id__in=ids).update(
+            status=OutgoingEmail.SENDING,
+            claim=claim,
+            next_attempt_at=now + timedelta(seconds=EMAIL_SENDING_TIMEOUT)
+        )
+        return list(OutgoingEmail.objects.filter(claim=claim))
+
+    def send_batch(self, executor, emails):
+        groups = [emails[index::self.workers] for index in range(self.workers)]
+        sent, failed = [], []
+        for results in executor.map(send_group, filter(None, groups)):
+            for email, error in results:
+                if error is None:
+                    sent.append(email.id)
+                else:
+                    failed.append((email, error))
+        now = timezone.now()
+        with transaction.atomic():
+            OutgoingEmail.objects.filter(id__in=sent).update(
+                status=OutgoingEmail.SENT,
+                attempts=F('attempts') + 1,
+                claim=None,
+                sent_at=now,
+                last_error=''
+            )
+            for email, error in failed:
+                email.attempts += 1
+                email.claim = None
+                email.last_error = error
+                if email.attempts >= self.max_attempts:
+                    email.status = OutgoingEmail.FAILED
+                else:
+                    email.status = OutgoingEmail.PENDING
+                    email.next_attempt_at = now + timedelta(
+                        seconds=EMAIL_RETRY_DELAY * 2 ** (email.attempts - 1)
+                    )
+                email.save(update_fields=(
+                    'attempts', 'claim', 'last_error', 'status',
+                    'next_attempt_at'
+                ))
+        self.stdout.write(f'Sent {len(sent)} emails, {len(failed)} failed')
@@ -0,0 +1,46 @@
+# Generated by Django 3.2 on 2026-10-18 19:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_title_score_counts(apps, schema_editor):
+    TitleScoreCount = apps.get_model('reviews', 'TitleScoreCount')
+    Review = apps.get_model('reviews', 'Review')
+    TitleScoreCount.objects.bulk_create(
+        TitleScoreCount(**row) for row in Review.objects.order_by().values(
+            'title_id', 'score'
+        ).annotate(count=Count('id'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_title_rating'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleScoreCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField(verbose_name='Оценка')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Количество оценок')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_counts', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Счётчик оценок',
+                'verbose_name_plural': 'Счётчики оценок',
+                'ordering': ['score'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='titlescorecount',
+            constraint=models.UniqueConstraint(fields=('title', 'score'), name='unique_title_score'),
+        ),
+        migrations.RunPython(
+            fill_title_score_counts, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 3.2 on 2026-10-18 19:56
+
+from django.db import migrations, models
+
+SLUG_TABLES = ('reviews_category', 'reviews_genre')
+SLUG_INDEX = '{table}_slug_iexact_idx'
+SLUG_INDEX_SQL = {
+    'sqlite': 'CREATE INDEX {index} ON {table} (slug COLLATE NOCASE)',
+    'postgresql': 'CREATE INDEX {index} ON {table} (UPPER(slug))',
+}
+
+
+def create_slug_indexes(apps, schema_editor):
+    statement = SLUG_INDEX_SQL.get(schema_editor.connection.vendor)
+    if statement is None:
+        return
+    for table in SLUG_TABLES:
+        schema_editor.execute(statement.format(
+            index=SLUG_INDEX.format(table=table), table=table
+        ))
+
+
+def drop_slug_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor not in SLUG_INDEX_SQL:
+        return
+    for table in SLUG_TABLES:
+        schema_editor.execute(
+            f'DROP INDEX IF EXISTS {SLUG_INDEX.format(table=table)}'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_outgoing_email'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['review', '-pub_date', '-id'], name='comment_review_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', '-pub_date', '-id'], name='review_title_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['name', 'id'], name='title_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'year'], name='title_category_year_idx'),
+        ),
+        migrations.RunPython(create_slug_indexes, drop_slug_indexes),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 3.2 on 2026-10-18 20:06
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils import timezone
+
+TRENDING_DAYS = 7
+
+
+def fill_title_rankings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    TitleRanking = apps.get_model('reviews', 'TitleRanking')
+    since = timezone.now() - timedelta(days=TRENDING_DAYS)
+    trending = dict(Review.objects.filter(
+        pub_date__gte=since
+    ).order_by().values('title_id').annotate(
+        count=Count('id')
+    ).values_list('title_id', 'count'))
+    genre_ids = {}
+    for title_id, genre_id in Title.genre.through.objects.values_list(
+        'title_id', 'genre_id'
+    ):
+        genre_ids.setdefault(title_id, []).append(genre_id)
+    objects = []
+    for title in Title.objects.values(
+        'id', 'category_id', 'score_sum', 'review_count'
+    ):
+        fields = {
+            'title_id': title['id'],
+            'score_sum': title['score_sum'],
+            'review_count': title['review_count'],
+            'score_mean': (
+                title['score_sum'] / title['review_count']
+                if title['review_count'] else None
+            ),
+            'trending': trending.get(title['id'], 0),
+        }
+        objects.append(TitleRanking(**fields))
+        if title['category_id'] is not None:
+            objects.append(
+                TitleRanking(category_id=title['category_id'], **fields)
+            )
+        for genre_id in genre_ids.get(title['id'], ()):
+            objects.append(TitleRanking(genre_id=genre_id, **fields))
+    TitleRanking.objects.bulk_create(objects, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleRanking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score_sum', models.PositiveIntegerField(default=0, verbose_name='Сумма оценок')),
+                ('review_count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('score_mean', models.FloatField(null=True, verbose_name='Средняя оценка')),
+                ('trending', models.PositiveIntegerField(default=0, verbose_name='Отзывов за период')),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='title_rankings', to='reviews.category', verbose_name='Категория')),
+                ('genre', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='title_rankings', to='reviews.genre', verbose_name='Жанр')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rankings', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Позиция в рейтинге',
+                'verbose_name_plural': 'Позиции в рейтингах',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['category', 'genre', '-score_mean', '-review_count', 'title'], name='ranking_top_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['category', 'genre', '-trending', '-score_mean', 'title'], name='ranking_trending_idx'),
+        ),
+        migrations.RunPython(fill_title_rankings, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,24 @@
+import re
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
-from django.db.models import UniqueConstraint
+from django.db import connections, models, transaction
+from django.db.models import (Count, ExpressionWrapper, F, FloatField,
+                              IntegerField, OuterRef, Q, Subquery, Sum,
+                              UniqueConstraint)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
 
 from api.v1.constants import (CORE_NAME_MAX_LENGTH, EMAIL_MAX_LENGTH,
                               MAX_SCORE, MIN_SCORE, ROLE_MAX_LENGTH,
                               TITLE_NAME_MAX_LENGTH, USERNAME_MAX_LENGTH)
+from reviews.constants import (EMAIL_STATUS_MAX_LENGTH,
+                               EMAIL_SUBJECT_MAX_LENGTH, RANKING_BATCH_SIZE,
+                               RANKING_TRENDING_DAYS, TITLE_SEARCH_CONFIG,
+                               TITLE_SEARCH_TABLE)
 from reviews.validators import validate_username, validate_year
 
 
@@ -111,6 +123,87 @@ class Genre(CoreModel):
         verbose_name_plural = 'Жанры'
 
 
+class TitleQuerySet(models.QuerySet):
+
+    def apply_review_delta(self, score_delta, count_delta):
+        score_sum = F('score_sum') + score_delta
+        review_count = F('review_count') + count_delta
+        return self.update(
+            score_sum=score_sum,
+            review_count=review_count,
+            rating=score_sum / NullIf(review_count, 0)
+        )
+
+    def refresh_ratings(self):
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        score_sum = Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0,
+            output_field=IntegerField()
+        )
+        review_count = Coalesce(
+            Subquery(reviews.annotate(total=Count('id')).values('total')),
+            0,
+            output_field=IntegerField()
+        )
+        return self.update(
+            score_sum=score_sum,
+            review_count=review_count,
+            rating=score_sum / NullIf(review_count, 0)
+        )
+
+    def search(self, text):
+        terms = re.findall(r'\w+', text)
+        if not terms:
+            return self
+        vendor = connections[self.db].vendor
+        if vendor == 'sqlite':
+            return self.search_sqlite(terms)
+        if vendor == 'postgresql':
+            return self.search_postgresql(terms)
+        condition = Q()
+        for term in terms:
+            condition &= (
+                Q(name__icontains=term) | Q(description__icontains=term)
+            )
+        return self.filter(condition)
+
+    def search_sqlite(self, terms):
+        match = ' '.join('"{}"*'.format(term) for term in terms)
+        matches = RawSQL(
+            f'SELECT rowid FROM {TITLE_SEARCH_TABLE} '
+            f'WHERE {TITLE_SEARCH_TABLE} MATCH %s',
+            (match,)
+        )
+        rank = RawSQL(
+            f'SELECT -bm25({TITLE_SEARCH_TABLE}) FROM {TITLE_SEARCH_TABLE} '
+            f'WHERE {TITLE_SEARCH_TABLE} MATCH %s '
+            f'AND rowid = {self.model._meta.db_table}.id',
+            (match,)
+        )
+        return self.filter(id__in=matches).annotate(
+            search_rank=rank
+        ).order_by('-search_rank', 'name', 'id')
+
+    def search_postgresql(self, terms):
+        from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                                    SearchVector)
+        vector = SearchVector(
+            'name', 'description', config=TITLE_SEARCH_CONFIG
+        )
+        query = SearchQuery(
+            ' & '.join(f'{term}:*' for term in terms),
+            config=TITLE_SEARCH_CONFIG,
+            search_type='raw'
+        )
+        return self.annotate(
+            search_vector=vector,
+            search_rank=SearchRank(vector, query)
+        ).filter(search_vector=query).order_by('-search_rank', 'name', 'id')
+
+
 class Title(models.Model):
     name = models.CharField(
         verbose_name='Название произведения',
@@ -134,11 +227,32 @@ class Title(models.Model):
         null=True,
         related_name='titles'
     )
+    rating = models.PositiveSmallIntegerField(
+        verbose_name='Рейтинг',
+        null=True,
+        blank=True
+    )
+    review_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0
+    )
+    score_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['name', 'id'], name='title_name_idx'),
+            models.Index(
+                fields=['category', 'year'], name='title_category_year_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -171,6 +285,257 @@ class Review(PublishedContent):
         constraints = [
             UniqueConstraint(fields=['title', 'author'], name='unique_review')
         ]
+        indexes = [
+            models.Index(
+                fields=['title', '-pub_date', '-id'],
+                name='review_title_pub_date_idx'
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class TitleScoreCountQuerySet(models.QuerySet):
+
+    def add_score(self, title_id, score, delta):
+        scores = self.filter(title_id=title_id, score=score)
+        if scores.update(count=F('count') + delta):
+            return
+        _, created = self.get_or_create(
+            title_id=title_id, score=score, defaults={'count': delta}
+        )
+        if not created:
+            scores.update(count=F('count') + delta)
+
+    def refresh(self, title_ids=None):
+        reviews = Review.objects.order_by()
+        scores = self.all()
+        if title_ids is not None:
+            reviews = reviews.filter(title_id__in=title_ids)
+            scores = scores.filter(title_id__in=title_ids)
+        scores.delete()
+        return self.bulk_create(
+            self.model(**row) for row in reviews.values(
+                'title_id', 'score'
+            ).annotate(count=Count('id'))
+        )
+
+
+class TitleScoreCount(models.Model):
+    title = models.ForeignKey(
+        Title,
+        verbose_name='Произведение',
+        related_name='score_counts',
+        on_delete=models.CASCADE
+    )
+    score = models.PositiveSmallIntegerField(verbose_name='Оценка')
+    count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0
+    )
+
+    objects = TitleScoreCountQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Счётчик оценок'
+        verbose_name_plural = 'Счётчики оценок'
+        ordering = ['score']
+        constraints = [
+            UniqueConstraint(
+                fields=['title', 'score'], name='unique_title_score'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.title_id}: {self.score} x {self.count}'
+
+
+def get_score_mean(score_sum, review_count):
+    return score_sum / review_count if review_count else None
+
+
+def get_trending_since():
+    return timezone.now() - timedelta(days=RANKING_TRENDING_DAYS)
+
+
+class TitleRankingQuerySet(models.QuerySet):
+
+    def overall(self):
+        return self.filter(category=None, genre=None)
+
+    def for_category(self, slug):
+        return self.filter(category__slug=slug, genre=None)
+
+    def for_genre(self, slug):
+        return self.filter(genre__slug=slug, category=None)
+
+    def top(self):
+        return self.filter(score_mean__isnull=False).order_by(
+            '-score_mean', '-review_count', 'title_id'
+        )
+
+    def trending(self):
+        return self.filter(trending__gt=0).order_by(
+            '-trending', '-score_mean', 'title_id'
+        )
+
+    def add_title(self, title):
+        objects = [self.model(title=title)]
+        if title.category_id is not None:
+            objects.append(
+                self.model(title=title, category_id=title.category_id)
+            )
+        return self.bulk_create(objects)
+
+    def add_groups(self, title_ids, field, group_ids):
+        return self.bulk_create(
+            self.model(
+                title_id=ranking.title_id,
+                score_sum=ranking.score_sum,
+                review_count=ranking.review_count,
+                score_mean=ranking.score_mean,
+                trending=ranking.trending,
+                **{field: group_id}
+            )
+            for ranking in self.overall().filter(title_id__in=title_ids)
+            for group_id in group_ids
+        )
+
+    def add_genres(self, title_ids, genre_ids):
+        return self.add_groups(title_ids, 'genre_id', genre_ids)
+
+    def set_category(self, title):
+        rankings = self.filter(title=title, genre=None).exclude(category=None)
+        if title.category_id is None:
+            return rankings.delete()
+        if not rankings.update(category_id=title.category_id):
+            self.add_groups([title.pk], 'category_id', [title.category_id])
+
+    def apply_title(self, title_id, trending_delta=0):
+        titles = Title.objects.filter(pk=title_id)
+        score_sum = Subquery(titles.values('score_sum'))
+        review_count = Subquery(titles.values('review_count'))
+        return self.filter(title_id=title_id).update(
+            score_sum=score_sum,
+            review_count=review_count,
+            score_mean=ExpressionWrapper(
+                Cast(score_sum, FloatField()) / NullIf(review_count, 0),
+                output_field=FloatField()
+            ),
+            trending=F('trending') + trending_delta
+        )
+
+    def refresh(self, title_ids=None):
+        titles = Title.objects.order_by()
+        genre_titles = Title.genre.through.objects.order_by()
+        reviews = Review.objects.order_by().filter(
+            pub_date__gte=get_trending_since()
+        )
+        rankings = self.all()
+        if title_ids is not None:
+            titles = titles.filter(id__in=title_ids)
+            genre_titles = genre_titles.filter(title_id__in=title_ids)
+            reviews = reviews.filter(title_id__in=title_ids)
+            rankings = rankings.filter(title_id__in=title_ids)
+        trending = dict(reviews.values('title_id').annotate(
+            count=Count('id')
+        ).values_list('title_id', 'count'))
+        genre_ids = {}
+        for title_id, genre_id in genre_titles.values_list(
+            'title_id', 'genre_id'
+        ):
+            genre_ids.setdefault(title_id, []).append(genre_id)
+        objects = []
+        for title in titles.values(
+            'id', 'category_id', 'score_sum', 'review_count'
+        ):
+            fields = {
+                'title_id': title['id'],
+                'score_sum': title['score_sum'],
+                'review_count': title['review_count'],
+                'score_mean': get_score_mean(
+                    title['score_sum'], title['review_count']
+                ),
+                'trending': trending.get(title['id'], 0),
+            }
+            objects.append(self.model(**fields))
+            if title['category_id'] is not None:
+                objects.append(
+                    self.model(category_id=title['category_id'], **fields)
+                )
+            for genre_id in genre_ids.get(title['id'], ()):
+                objects.append(self.model(genre_id=genre_id, **fields))
+        with transaction.atomic(using=self.db):
+            rankings.delete()
+            return self.bulk_create(objects, batch_size=RANKING_BATCH_SIZE)
+
+
+class TitleRanking(models.Model):
+    """Position of a title in the overall, category and genre rankings.
+
+    Every title has a row without a category and genre, a row for its
+    category and a row per genre, so a ranking is read from an index.
+    """
+
+    title = models.ForeignKey(
+        Title,
+        verbose_name='Произведение',
+        related_name='rankings',
+        on_delete=models.CASCADE
+    )
+    category = models.ForeignKey(
+        Category,
+        verbose_name='Категория',
+        related_name='title_rankings',
+        on_delete=models.CASCADE,
+        null=True
+    )
+    genre = models.ForeignKey(
+        Genre,
+        verbose_name='Жанр',
+        related_name='title_rankings',
+        on_delete=models.CASCADE,
+        null=True
+    )
+    score_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0
+    )
+    review_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0
+    )
+    score_mean = models.FloatField(
+        verbose_name='Средняя оценка',
+        null=True
+    )
+    trending = models.PositiveIntegerField(
+        verbose_name='Отзывов за период',
+        default=0
+    )
+
+    objects = TitleRankingQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Позиция в рейтинге'
+        verbose_name_plural = 'Позиции в рейтингах'
+        indexes = [
+            models.Index(
+                fields=['category', 'genre', '-score_mean', '-review_count',
+                        'title'],
+                name='ranking_top_idx'
+            ),
+            models.Index(
+                fields=['category', 'genre', '-trending', '-score_mean',
+                        'title'],
+                name='ranking_trending_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.title_id}: {self.score_mean} / {self.trending}'
 
 
 class Comment(PublishedContent):
@@ -185,3 +550,71 @@ class Comment(PublishedContent):
     class Meta(PublishedContent.Meta):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=['review', '-pub_date', '-id'],
+                name='comment_review_pub_date_idx'
+            ),
+        ]
+
+
+class OutgoingEmail(models.Model):
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+    STATUSES = (
+        (PENDING, 'Ожидает отправки'),
+        (SENDING, 'Отправляется'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Ошибка'),
+    )
+
+    recipient = models.EmailField(
+        verbose_name='Получатель',
+        max_length=EMAIL_MAX_LENGTH
+    )
+    from_email = models.EmailField(
+        verbose_name='Отправитель',
+        max_length=EMAIL_MAX_LENGTH
+    )
+    subject = models.CharField(
+        verbose_name='Тема',
+        max_length=EMAIL_SUBJECT_MAX_LENGTH
+    )
+    message = models.TextField(verbose_name='Текст письма')
+    status = models.CharField(
+        verbose_name='Статус',
+        max_length=EMAIL_STATUS_MAX_LENGTH,
+        choices=STATUSES,
+        default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Попытки отправки',
+        default=0
+    )
+    last_error = models.TextField(verbose_name='Последняя ошибка', blank=True)
+    claim = models.UUIDField(verbose_name='Метка обработчика', null=True)
+    created = models.DateTimeField(
+        verbose_name='Дата создания',
+        auto_now_add=True
+    )
+    next_attempt_at = models.DateTimeField(
+        verbose_name='Следующая попытка',
+        default=timezone.now,
+        db_index=True
+    )
+    sent_at = models.DateTimeField(
+        verbose_name='Дата отправки',
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ['id']
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
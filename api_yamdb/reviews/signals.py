@@ -0,0 +1,92 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_save)
+from django.dispatch import receiver
+
+from reviews.models import (Review, Title, TitleRanking, TitleScoreCount,
+                            get_trending_since)
+
+
+def is_trending(review):
+    return review.pub_date >= get_trending_since()
+
+
+def add_review_score(title_id, score, sign=1, trending=True):
+    Title.objects.filter(pk=title_id).apply_review_delta(sign * score, sign)
+    TitleScoreCount.objects.add_score(title_id, score, sign)
+    TitleRanking.objects.apply_title(title_id, sign if trending else 0)
+
+
+def change_review_score(title_id, old_score, new_score):
+    Title.objects.filter(pk=title_id).apply_review_delta(
+        new_score - old_score, 0
+    )
+    TitleScoreCount.objects.add_score(title_id, old_score, -1)
+    TitleScoreCount.objects.add_score(title_id, new_score, 1)
+    TitleRanking.objects.apply_title(title_id)
+
+
+@receiver(pre_save, sender=Review)
+def remember_review_score(sender, instance, raw=False, **kwargs):
+    instance._previous_score = None
+    if raw or instance._state.adding:
+        return
+    instance._previous_score = Review.objects.filter(
+        pk=instance.pk
+    ).values_list('title_id', 'score').first()
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_score', None)
+    if previous is None:
+        add_review_score(instance.title_id, instance.score)
+        return
+    title_id, score = previous
+    if title_id != instance.title_id:
+        trending = is_trending(instance)
+        add_review_score(title_id, score, -1, trending)
+        add_review_score(instance.title_id, instance.score, 1, trending)
+    elif score != instance.score:
+        change_review_score(title_id, score, instance.score)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    add_review_score(
+        instance.title_id, instance.score, -1, is_trending(instance)
+    )
+
+
+@receiver(post_save, sender=Title)
+def refresh_title_rankings(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        TitleRanking.objects.add_title(instance)
+    else:
+        TitleRanking.objects.set_category(instance)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def update_genre_rankings(sender, instance, action, reverse, pk_set,
+                          **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        title_ids, genre_ids = pk_set, [instance.pk]
+        rankings = TitleRanking.objects.filter(genre=instance)
+        if pk_set is not None:
+            rankings = rankings.filter(title_id__in=pk_set)
+    else:
+        title_ids, genre_ids = [instance.pk], pk_set
+        rankings = TitleRanking.objects.filter(
+            title=instance, genre__isnull=False
+        )
+        if pk_set is not None:
+            rankings = rankings.filter(genre_id__in=pk_set)
+    if action == 'post_add':
+        TitleRanking.objects.add_genres(title_ids, genre_ids)
+    else:
+        rankings.delete()
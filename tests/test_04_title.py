@@ -350,3 +350,46 @@ class Test04TitleAPI:
             f'Проверьте, что PUT-запрос к `{self.TITLES_DETAIL_URL_TEMPLATE} '
             'не предусмотрен и возвращает статус 405.'
         )
+
+    def test_07_titles_full_text_search(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(self.TITLES_URL, {'search': 'орешек'})
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [
+            titles[1]['id']
+        ], (
+            'Проверьте, что параметр `search` эндпоинта '
+            f'`{self.TITLES_URL}` ищет по названию произведения.'
+        )
+
+        response = client.get(self.TITLES_URL, {'search': 'bac'})
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[0]['id']
+        ], (
+            'Проверьте, что параметр `search` эндпоинта '
+            f'`{self.TITLES_URL}` ищет по началу слова в описании.'
+        )
+
+        admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            data={'name': 'Орешек знаний', 'description': ''}
+        )
+        response = client.get(self.TITLES_URL, {'search': 'орешек'})
+        results = response.json()['results']
+        assert {title['id'] for title in results} == {
+            titles[0]['id'], titles[1]['id']
+        }, (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+        response = client.get(self.TITLES_URL, {'search': 'back'})
+        assert response.json()['count'] == 0
+
+        admin_client.delete(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[1]['id'])
+        )
+        response = client.get(self.TITLES_URL, {'search': 'орешек'})
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[0]['id']
+        ]
@@ -1,3 +1,4 @@
+import json
 from http import HTTPStatus
 
 import pytest
@@ -410,3 +411,156 @@ class Test05ReviewAPI:
             f'Проверьте, что PUT-запрос к `{self.REVIEW_DETAIL_URL_TEMPLATE} '
             'не предусмотрен и возвращает статус 405.'
         )
+
+    def test_07_review_updates_title_rating(
+            self, admin_client, admin, user_client, user, moderator_client,
+            moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        assert admin_client.get(title_url).json()['rating'] == 5, (
+            'Проверьте, что после создания отзывов поле `rating` '
+            'произведения содержит среднюю оценку.'
+        )
+
+        admin_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            ),
+            data={'score': 8}
+        )
+        assert admin_client.get(title_url).json()['rating'] == 6, (
+            'Проверьте, что изменение оценки в отзыве пересчитывает поле '
+            '`rating` произведения.'
+        )
+
+        for review in reviews:
+            admin_client.delete(
+                self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                    title_id=titles[0]['id'], review_id=review['id']
+                )
+            )
+        assert admin_client.get(title_url).json()['rating'] is None, (
+            'Проверьте, что после удаления всех отзывов поле `rating` '
+            'произведения равно `None`.'
+        )
+
+    def test_08_title_stats(self, client, admin_client, admin, user_client,
+                            user, moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        stats_url = f'/api/v1/titles/{titles[0]["id"]}/stats/'
+        admin_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            ),
+            data={'score': 9}
+        )
+        response = client.get(stats_url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{stats_url}` возвращает ответ '
+            'со статусом 200.'
+        )
+        data = response.json()
+        assert data['count'] == 3
+        assert data['distribution']['5'] == 2
+        assert data['distribution']['9'] == 1
+        assert data['distribution']['1'] == 0
+        assert data['median'] == 5
+        assert abs(data['mean'] - 19 / 3) < 1e-9
+        assert data['percentiles']['90'] == 8.2
+
+        response = client.get(f'/api/v1/titles/{titles[1]["id"]}/stats/')
+        data = response.json()
+        assert data['count'] == 0
+        assert data['mean'] is None
+        assert data['median'] is None
+
+    def test_09_bulk_reviews(self, client, admin_client, user_client, user):
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/reviews/bulk/'
+        data = [
+            {'title_id': titles[0]['id'], 'text': 'Отлично', 'score': 9},
+            {'title_id': titles[1]['id'], 'text': 'Неплохо', 'score': 6},
+            {'title_id': titles[0]['id'], 'text': 'Повтор', 'score': 1},
+            {'title_id': 0, 'text': 'Нет такого', 'score': 5},
+            {'title_id': titles[1]['id'], 'score': 11},
+            {'title_id': 2 ** 70, 'text': 'Переполнение', 'score': 5},
+        ]
+        response = client.post(
+            url, data=json.dumps(data), content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            f'Проверьте, что POST-запрос неавторизованного пользователя к '
+            f'`{url}` возвращает ответ со статусом 401.'
+        )
+
+        response = user_client.post(url, data=data, format='json')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос к `{url}` возвращает ответ со '
+            'статусом 200 и результатом для каждого отзыва.'
+        )
+        results = response.json()
+        assert [result['status'] for result in results] == [
+            HTTPStatus.CREATED, HTTPStatus.CREATED, HTTPStatus.BAD_REQUEST,
+            HTTPStatus.BAD_REQUEST, HTTPStatus.BAD_REQUEST,
+            HTTPStatus.BAD_REQUEST
+        ]
+        assert 'title_id' in results[3]['errors']
+        assert set(results[4]['errors']) == {'text', 'score'}
+        assert 'title_id' in results[5]['errors'], (
+            'Проверьте, что слишком большой `title_id` возвращает ошибку '
+            'для отдельного отзыва, а не ошибку сервера.'
+        )
+
+        response = client.get(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=results[0]['id']
+            )
+        )
+        assert response.json()['author'] == user.username
+        assert response.json()['score'] == 9
+        title = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[1]['id'])
+        ).json()
+        assert title['rating'] == 6, (
+            f'Проверьте, что отзывы, созданные через `{url}`, обновляют '
+            'рейтинг произведения.'
+        )
+
+        response = user_client.post(url, data=data[:1], format='json')
+        assert response.json()[0]['status'] == HTTPStatus.BAD_REQUEST
+        response = user_client.post(url, data={}, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_10_duplicate_review(self, admin_client, user_client, user):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = user_client.post(url, data={'text': 'Отзыв', 'score': 8})
+        assert response.status_code == HTTPStatus.CREATED
+
+        response = user_client.post(url, data={'text': 'Ещё отзыв', 'score': 2})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв пользователя на то же '
+            'произведение возвращает ответ со статусом 400.'
+        )
+        assert response.json() == {
+            'non_field_errors': ['Вы уже оставили отзыв на это произведение.']
+        }
+        response = admin_client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        assert response.json()['rating'] == 8, (
+            'Проверьте, что отклонённый повторный отзыв не меняет рейтинг '
+            'произведения.'
+        )
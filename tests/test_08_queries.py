@@ -0,0 +1,247 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from tests.utils import create_comments
+
+from reviews.models import Comment, Genre, Review, Title, User
+
+
+def count_queries(client, method, url, data=None):
+    cache.clear()
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(client, method)(url, data=data)
+    assert response.status_code < HTTPStatus.BAD_REQUEST, (
+        f'Проверьте, что {method.upper()}-запрос к `{url}` выполняется '
+        f'успешно. Получен ответ со статусом {response.status_code}.'
+    )
+    return len(context.captured_queries)
+
+
+def check_query_budget(client, method, url, budget, data=None):
+    queries = count_queries(client, method, url, data)
+    assert queries <= budget, (
+        f'Проверьте, что {method.upper()}-запрос к `{url}` выполняет не '
+        f'больше {budget} SQL-запросов. Сейчас выполняется {queries}.'
+    )
+
+
+def create_extra_titles(count):
+    genres = list(Genre.objects.all())
+    for idx in range(count):
+        title = Title.objects.create(
+            name=f'Extra title {idx}', year=2000, category=None
+        )
+        title.genre.set(genres)
+
+
+def create_extra_reviews(title_id, review_id, count):
+    for idx in range(count):
+        author = User.objects.create(
+            username=f'extra_author_{idx}',
+            email=f'extra_author_{idx}@yamdb.fake'
+        )
+        Review.objects.create(
+            title_id=title_id, author=author, text='Отзыв', score=5
+        )
+        Comment.objects.create(
+            review_id=review_id, author=author, text='Комментарий'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08QueryBudget:
+
+    ANONYMOUS_BUDGETS = (
+        ('/api/v1/categories/', 2),
+        ('/api/v1/genres/', 2),
+        ('/api/v1/titles/', 3),
+        ('/api/v1/titles/{title_id}/', 2),
+        ('/api/v1/titles/{title_id}/stats/', 2),
+        ('/api/v1/titles/{title_id}/reviews/', 3),
+        ('/api/v1/titles/{title_id}/reviews/{review_id}/', 1),
+        ('/api/v1/titles/{title_id}/reviews/{review_id}/comments/', 3),
+        (
+            '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+            '{comment_id}/',
+            1
+        ),
+    )
+    ADMIN_BUDGETS = (
+        ('/api/v1/users/', 2),
+        ('/api/v1/users/me/', 0),
+        ('/api/v1/users/{username}/', 1),
+    )
+
+    def format_url(self, url, comments, reviews, titles, username):
+        return url.format(
+            title_id=titles[0]['id'],
+            review_id=reviews[0]['id'],
+            comment_id=comments[0]['id'],
+            username=username
+        )
+
+    def test_01_read_endpoints_budget(self, client, admin_client, admin,
+                                      user_client, user, moderator_client,
+                                      moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        for url, budget in self.ANONYMOUS_BUDGETS:
+            url = self.format_url(url, comments, reviews, titles, '')
+            check_query_budget(client, 'get', url, budget)
+            check_query_budget(user_client, 'get', url, budget + 1)
+        for url, budget in self.ADMIN_BUDGETS:
+            url = self.format_url(
+                url, comments, reviews, titles, user.username
+            )
+            check_query_budget(admin_client, 'get', url, budget + 1)
+
+    def test_02_write_endpoints_budget(self, admin_client, admin,
+                                       user_client, user, moderator_client,
+                                       moderator):
+        author_map = {admin: admin_client, moderator: moderator_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        reviews_url = f'{title_url}reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+
+        check_query_budget(
+            admin_client, 'post', '/api/v1/titles/', 13,
+            {
+                'name': 'Новое произведение',
+                'year': 2000,
+                'genre': ['horror', 'comedy'],
+                'category': 'films'
+            }
+        )
+        check_query_budget(
+            admin_client, 'patch', title_url, 17,
+            {'genre': ['drama'], 'category': 'books'}
+        )
+        check_query_budget(
+            user_client, 'post', reviews_url, 11,
+            {'text': 'Отзыв', 'score': 7}
+        )
+        check_query_budget(
+            user_client, 'post', comments_url, 3, {'text': 'Комментарий'}
+        )
+        check_query_budget(
+            admin_client, 'patch', f'{comments_url}{comments[0]["id"]}/', 2,
+            {'text': 'Исправленный комментарий'}
+        )
+
+    def test_03_title_list_does_not_depend_on_page_size(self, client,
+                                                        admin_client):
+        create_comments(admin_client, {})
+        create_extra_titles(1)
+        small_page = count_queries(client, 'get', '/api/v1/titles/')
+        create_extra_titles(20)
+        full_page = count_queries(client, 'get', '/api/v1/titles/')
+        assert small_page == full_page, (
+            'Проверьте, что количество SQL-запросов к `/api/v1/titles/` не '
+            'зависит от количества произведений на странице.'
+        )
+
+    def test_04_authentication_reuses_verified_token(self, admin_client,
+                                                     user_client, user):
+        user_client.get('/api/v1/categories/')
+        with CaptureQueriesContext(connection) as context:
+            user_client.get('/api/v1/categories/')
+        assert not any(
+            'reviews_user' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что повторный запрос с тем же токеном не '
+            'загружает пользователя из базы данных.'
+        )
+
+        data = {'name': 'Музыка', 'slug': 'music'}
+        response = user_client.post('/api/v1/categories/', data=data)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        response = user_client.post('/api/v1/categories/', data=data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что изменение роли пользователя сбрасывает '
+            'закешированные данные аутентификации.'
+        )
+
+    @pytest.mark.parametrize('data,status,expected_queries', [
+        (
+            {'username': 'newcomer', 'email': 'newcomer@yamdb.fake'},
+            HTTPStatus.OK,
+            4
+        ),
+        (
+            {'username': 'TestUser', 'email': 'testuser@yamdb.fake'},
+            HTTPStatus.OK,
+            3
+        ),
+        (
+            {'username': 'TestUser', 'email': 'other@yamdb.fake'},
+            HTTPStatus.BAD_REQUEST,
+            1
+        ),
+    ])
+    def test_05_signup_round_trips(self, client, user, data, status,
+                                   expected_queries):
+        with CaptureQueriesContext(connection) as context:
+            response = client.post('/api/v1/auth/signup/', data=data)
+        assert response.status_code == status
+        queries = len(context.captured_queries)
+        assert queries == expected_queries, (
+            'Проверьте, что регистрация выполняет '
+            f'{expected_queries} обращений к базе данных. Сейчас '
+            f'выполняется {queries}.'
+        )
+
+    def test_06_nested_detail_checks_parents(self, client, admin_client,
+                                             admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        other_title = Title.objects.exclude(id=titles[0]['id']).first()
+        review_url = (
+            f'/api/v1/titles/{other_title.id}/reviews/{reviews[0]["id"]}/'
+        )
+        comment_url = f'{review_url}comments/{comments[0]["id"]}/'
+        for url in (review_url, comment_url):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что запрос к `{url}` с чужим произведением '
+                'возвращает ответ со статусом 404.'
+            )
+            assert len(context.captured_queries) == 1, (
+                'Проверьте, что принадлежность отзыва и комментария '
+                'произведению проверяется в одном запросе вместе с выборкой '
+                'объекта.'
+            )
+
+    def test_07_reviews_and_comments_do_not_depend_on_page_size(
+            self, client, admin_client, admin):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        small_pages = [
+            count_queries(client, 'get', url)
+            for url in (reviews_url, comments_url)
+        ]
+        create_extra_reviews(titles[0]['id'], reviews[0]['id'], 9)
+        full_pages = [
+            count_queries(client, 'get', url)
+            for url in (reviews_url, comments_url)
+        ]
+        assert small_pages == full_pages, (
+            'Проверьте, что количество SQL-запросов к спискам отзывов и '
+            'комментариев не зависит от количества авторов на странице.'
+        )
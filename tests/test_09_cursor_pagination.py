@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from tests.utils import create_reviews
+
+from reviews.models import Title
+
+
+def collect_cursor_pages(client, url):
+    results = []
+    next_url = f'{url}?cursor='
+    while next_url:
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(next_url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` с параметром `cursor` '
+            'возвращает ответ со статусом 200.'
+        )
+        assert not any(
+            'COUNT(' in query['sql'].upper()
+            for query in context.captured_queries
+        ), (
+            f'Проверьте, что курсорная пагинация `{url}` не выполняет '
+            'запрос COUNT.'
+        )
+        data = response.json()
+        assert 'count' not in data
+        results.extend(data['results'])
+        next_url = data['next']
+    return results
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09CursorPagination:
+
+    def test_01_titles_cursor(self, client, admin_client):
+        create_reviews(admin_client, {})
+        for idx in range(25):
+            Title.objects.create(name='Одинаковое название', year=2000 + idx)
+
+        response = client.get('/api/v1/titles/')
+        assert response.json()['count'] == 27, (
+            'Проверьте, что без параметра `cursor` эндпоинт '
+            '`/api/v1/titles/` использует постраничную пагинацию.'
+        )
+
+        results = collect_cursor_pages(client, '/api/v1/titles/')
+        ids = [title['id'] for title in results]
+        assert len(ids) == len(set(ids)) == 27, (
+            'Проверьте, что курсорная пагинация `/api/v1/titles/` '
+            'возвращает каждое произведение ровно один раз.'
+        )
+        assert ids == list(
+            Title.objects.order_by('name', 'id').values_list('id', flat=True)
+        )
+
+    def test_02_reviews_cursor(self, admin_client, admin, user_client, user,
+                               moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        results = collect_cursor_pages(admin_client, url)
+        assert [review['id'] for review in results] == [
+            review['id'] for review in reversed(reviews)
+        ], (
+            f'Проверьте, что курсорная пагинация `{url}` сортирует отзывы '
+            'от новых к старым.'
+        )
@@ -0,0 +1,180 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from tests.utils import create_reviews, create_single_review
+
+from api.v1.cache import get_version, get_version_keys
+from reviews.models import Review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10ResponseCache:
+
+    def test_01_cached_read_skips_database(self, client, admin_client):
+        create_reviews(admin_client, {})
+        response = client.get('/api/v1/titles/')
+        with CaptureQueriesContext(connection) as context:
+            cached = client.get('/api/v1/titles/')
+        assert cached.json() == response.json()
+        assert len(context.captured_queries) == 0, (
+            'Проверьте, что повторный GET-запрос к `/api/v1/titles/` '
+            'отдаётся из кеша без обращения к базе данных.'
+        )
+
+    def test_02_write_invalidates_cache(self, client, admin_client, admin):
+        _, titles = create_reviews(admin_client, {})
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        reviews_url = f'{title_url}reviews/'
+        assert client.get(title_url).json()['rating'] is None
+        assert client.get(reviews_url).json()['count'] == 0
+
+        create_single_review(admin_client, titles[0]['id'], 'Отзыв', 8)
+        assert client.get(title_url).json()['rating'] == 8, (
+            'Проверьте, что создание отзыва сбрасывает кеш произведения.'
+        )
+        assert client.get(reviews_url).json()['count'] == 1, (
+            'Проверьте, что создание отзыва сбрасывает кеш списка отзывов.'
+        )
+
+        admin_client.patch(
+            '/api/v1/users/me/', data={'username': 'RenamedAdmin'}
+        )
+        author = client.get(reviews_url).json()['results'][0]['author']
+        assert author == 'RenamedAdmin', (
+            'Проверьте, что изменение имени пользователя сбрасывает кеш '
+            'списка отзывов.'
+        )
+
+        response = admin_client.delete('/api/v1/categories/films/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert client.get(title_url).json()['category'] is None, (
+            'Проверьте, что удаление категории сбрасывает кеш произведений.'
+        )
+        assert client.get('/api/v1/categories/').json()['count'] == 1
+
+    def test_03_conditional_get(self, client, admin_client, admin):
+        reviews, titles = create_reviews(admin_client, {})
+        urls = (
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+        )
+        for url in urls:
+            response = client.get(url)
+            etag = response.get('ETag')
+            assert etag and response.get('Last-Modified'), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+                'заголовки `ETag` и `Last-Modified`.'
+            )
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{url}` с актуальным '
+                '`If-None-Match` возвращает ответ со статусом 304.'
+            )
+            assert len(context.captured_queries) == 0
+
+        etag = client.get(urls[1]).get('ETag')
+        create_single_review(admin_client, titles[0]['id'], 'Отзыв', 3)
+        response = client.get(urls[1], HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после создания отзыва GET-запрос к списку '
+            'отзывов со старым `If-None-Match` возвращает ответ со '
+            'статусом 200.'
+        )
+        assert response.get('ETag') != etag
+
+    def test_04_versions_bumped_after_commit(self, client, admin_client,
+                                             admin):
+        _, titles = create_reviews(admin_client, {})
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = client.get(url).get('ETag')
+        version = get_version('reviews')[0]
+
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Review.objects.create(
+                    title_id=titles[0]['id'], author=admin,
+                    text='Отзыв', score=4
+                )
+                raise RuntimeError
+        assert get_version('reviews')[0] == version, (
+            'Проверьте, что откаченная запись не сбрасывает кеш.'
+        )
+
+        with transaction.atomic():
+            Review.objects.create(
+                title_id=titles[0]['id'], author=admin, text='Отзыв', score=4
+            )
+            assert get_version('reviews')[0] == version, (
+                'Проверьте, что версия кеша меняется только после фиксации '
+                'транзакции, иначе параллельный запрос закеширует старые '
+                'данные под новой версией.'
+            )
+        assert get_version('reviews')[0] != version
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 1
+
+    def test_05_cache_key_includes_host(self, client, admin_client):
+        create_reviews(admin_client, {})
+        for index in range(10):
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {index}', 'year': 2000,
+                'genre': ['drama'], 'category': 'books'
+            })
+        url = '/api/v1/titles/'
+        client.get(url, HTTP_HOST='evil.example')
+        response = client.get(url, HTTP_HOST='testserver')
+        assert response.json()['next'].startswith('http://testserver/'), (
+            'Проверьте, что ключ кеша ответа учитывает хост запроса, иначе '
+            'поддельный заголовок `Host` попадёт в ссылки пагинации.'
+        )
+
+    def test_06_versions_shared_between_workers(self, admin_client):
+        _, titles = create_reviews(admin_client, {})
+        version_key, _ = get_version_keys('titles')
+        version = get_version('titles')[0]
+        worker = caches.create_connection('versions')
+        assert worker.get(version_key) == version
+
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'year': 1990}
+        )
+        assert worker.get(version_key) not in (None, version), (
+            'Проверьте, что версии кеша хранятся в общем для всех процессов '
+            'кеше, иначе запись сбрасывает кеш только в своём процессе.'
+        )
+
+    def test_07_conditional_get_after_lookup(self, client, admin_client,
+                                            admin):
+        _, titles = create_reviews(admin_client, {})
+        future = 'Fri, 01 Jan 2100 00:00:00 GMT'
+        response = client.get(
+            '/api/v1/titles/99999999/', HTTP_IF_MODIFIED_SINCE=future
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что условный GET-запрос к несуществующему объекту '
+            'возвращает ответ со статусом 404.'
+        )
+
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url)
+        etag = response['ETag']
+        cached = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert cached.status_code == HTTPStatus.NOT_MODIFIED
+        assert cached.get('ETag') == etag and cached.get('Last-Modified'), (
+            'Проверьте, что ответ со статусом 304 содержит заголовки `ETag` '
+            'и `Last-Modified`.'
+        )
+
+        last_modified = response['Last-Modified']
+        create_single_review(admin_client, titles[0]['id'], 'Отзыв', 3)
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что свежесть ответа определяется по `ETag`: '
+            '`Last-Modified` не различает записи в пределах одной секунды.'
+        )
+        assert response.json()['count'] == 1
@@ -0,0 +1,93 @@
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Avg, Count
+from tests.conftest import MANAGE_PATH
+
+from reviews.management.commands.import_csv import Command
+from reviews.models import (Comment, Genre, Review, Title, TitleScoreCount,
+                            User)
+
+CSV_PATH = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def import_csv(*args, **kwargs):
+    call_command('import_csv', '--path', CSV_PATH, *args, **kwargs)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ImportCsv:
+
+    def test_01_import(self, tmp_path):
+        import_csv(
+            '--batch-size', '7',
+            '--checkpoint', str(tmp_path / 'checkpoint.json')
+        )
+        assert User.objects.count() == 5
+        assert Genre.objects.count() == 15
+        assert Title.objects.count() == 32
+        assert Title.genre.through.objects.count() == 42
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+
+        for title in Title.objects.annotate(
+            average=Avg('reviews__score'), reviews_total=Count('reviews')
+        ):
+            assert title.review_count == title.reviews_total, (
+                'Проверьте, что после импорта у произведения обновляется '
+                'количество отзывов.'
+            )
+            expected = int(title.average) if title.average else None
+            assert title.rating == expected, (
+                'Проверьте, что после импорта у произведения обновляется '
+                'рейтинг.'
+            )
+        assert sum(
+            TitleScoreCount.objects.values_list('count', flat=True)
+        ) == 72
+
+    def test_02_import_is_idempotent(self, tmp_path):
+        checkpoint = str(tmp_path / 'checkpoint.json')
+        import_csv('--checkpoint', checkpoint)
+        import_csv('--checkpoint', checkpoint)
+        assert Title.objects.count() == 32
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+
+    def test_03_resume_from_checkpoint(self, tmp_path, monkeypatch):
+        checkpoint = str(tmp_path / 'checkpoint.json')
+        build_reviews = Command.build_reviews
+        calls = []
+
+        def failing_build_reviews(self, chunk):
+            calls.append(chunk)
+            if len(calls) == 2:
+                raise RuntimeError('Import interrupted')
+            return build_reviews(self, chunk)
+
+        monkeypatch.setattr(Command, 'build_reviews', failing_build_reviews)
+        with pytest.raises(RuntimeError):
+            import_csv('--batch-size', '10', '--checkpoint', checkpoint)
+        assert Review.objects.count() == 10, (
+            'Проверьте, что `import_csv` фиксирует каждую порцию строк в '
+            'отдельной транзакции.'
+        )
+        assert os.path.exists(checkpoint)
+
+        monkeypatch.setattr(Command, 'build_reviews', build_reviews)
+        stdout = StringIO()
+        import_csv(
+            '--batch-size', '10', '--checkpoint', checkpoint, '--resume',
+            stdout=stdout
+        )
+        output = stdout.getvalue()
+        assert 'users.csv' not in output, (
+            'Проверьте, что `import_csv --resume` не загружает повторно '
+            'уже импортированные файлы.'
+        )
+        assert f'after id {calls[0][-1]["id"]}' in output
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+        assert not os.path.exists(checkpoint)
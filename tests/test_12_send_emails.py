@@ -0,0 +1,145 @@
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews.management.commands import send_emails
+from reviews.models import OutgoingEmail
+
+
+class RefusingBackend(BaseEmailBackend):
+
+    def open(self):
+        raise ConnectionRefusedError('Connection refused')
+
+    def send_messages(self, email_messages):
+        return 0
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12SendEmails:
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_queues_email(self, client):
+        outbox_before_count = len(mail.outbox)
+        data = {'email': 'queued@yamdb.fake', 'username': 'queued'}
+        client.post(self.URL_SIGNUP, data=data)
+        assert len(mail.outbox) == outbox_before_count, (
+            f'Проверьте, что POST-запрос к `{self.URL_SIGNUP}` не отправляет '
+            'письмо синхронно, а только ставит его в очередь.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == data['email']
+        assert email.status == OutgoingEmail.PENDING
+
+        call_command('send_emails', '--once', '--workers', '2')
+        assert len(mail.outbox) == outbox_before_count + 1
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.SENT
+        assert email.sent_at is not None
+
+    def test_02_failed_email_is_retried(self, monkeypatch):
+        email = OutgoingEmail.objects.create(
+            recipient='retry@yamdb.fake',
+            from_email='registration@yamdb.com',
+            subject='Код подтверждения',
+            message='12345'
+        )
+
+        def fail(self):
+            raise ConnectionError('SMTP is down')
+
+        monkeypatch.setattr(send_emails.EmailMessage, 'send', fail)
+        call_command('send_emails', '--once')
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.PENDING
+        assert email.attempts == 1
+        assert email.last_error == 'SMTP is down'
+        assert email.next_attempt_at > timezone.now()
+
+        monkeypatch.undo()
+        call_command('send_emails', '--once')
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.PENDING, (
+            'Проверьте, что письмо не отправляется повторно до наступления '
+            'времени следующей попытки.'
+        )
+
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        call_command('send_emails', '--once')
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.SENT
+        assert email.attempts == 2
+
+    def test_03_email_fails_after_max_attempts(self, monkeypatch):
+        email = OutgoingEmail.objects.create(
+            recipient='broken@yamdb.fake',
+            from_email='registration@yamdb.com',
+            subject='Код подтверждения',
+            message='12345'
+        )
+
+        def fail(self):
+            raise ConnectionError('Mailbox unavailable')
+
+        monkeypatch.setattr(send_emails.EmailMessage, 'send', fail)
+        call_command('send_emails', '--once', '--max-attempts', '1')
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.FAILED
+
+    def test_04_unavailable_server(self, settings):
+        settings.EMAIL_BACKEND = 'tests.test_12_send_emails.RefusingBackend'
+        emails = [
+            OutgoingEmail.objects.create(
+                recipient=f'refused{index}@yamdb.fake',
+                from_email='registration@yamdb.com',
+                subject='Код подтверждения',
+                message='12345'
+            )
+            for index in range(3)
+        ]
+        call_command('send_emails', '--once', '--workers', '2')
+        for email in emails:
+            email.refresh_from_db()
+            assert email.status == OutgoingEmail.PENDING, (
+                'Проверьте, что при недоступном почтовом сервере письма '
+                'возвращаются в очередь.'
+            )
+            assert email.attempts == 1, (
+                'Проверьте, что ошибка подключения к почтовому серверу '
+                'засчитывается как попытка отправки.'
+            )
+            assert email.claim is None
+            assert email.last_error == 'Connection refused'
+            assert email.next_attempt_at > timezone.now()
+
+    def test_05_stale_sending_counts_attempt(self):
+        outbox_before_count = len(mail.outbox)
+        emails = [
+            OutgoingEmail.objects.create(
+                recipient=f'stale{index}@yamdb.fake',
+                from_email='registration@yamdb.com',
+                subject='Код подтверждения',
+                message='12345',
+                status=OutgoingEmail.SENDING,
+                attempts=index
+            )
+            for index in range(2)
+        ]
+        call_command('send_emails', '--once', '--max-attempts', '2')
+        retried, failed = emails
+        retried.refresh_from_db()
+        assert retried.status == OutgoingEmail.SENT
+        assert retried.attempts == 2, (
+            'Проверьте, что повторный захват зависшего письма засчитывается '
+            'как попытка отправки.'
+        )
+        failed.refresh_from_db()
+        assert failed.status == OutgoingEmail.FAILED, (
+            'Проверьте, что зависшее письмо, исчерпавшее `--max-attempts`, '
+            'помечается как неотправленное.'
+        )
+        assert failed.attempts == 2
+        assert failed.claim is None
+        assert len(mail.outbox) == outbox_before_count + 1
@@ -0,0 +1,98 @@
+import csv
+import json
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from tests.utils import create_reviews, create_titles
+
+from reviews.models import Title
+
+
+def read_stream(response):
+    return b''.join(response.streaming_content).decode('utf-8')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13Export:
+
+    URL = '/api/v1/titles/export/'
+
+    def test_01_permissions(self, client, user_client, moderator_client,
+                            admin_client):
+        assert client.get(self.URL).status_code == HTTPStatus.UNAUTHORIZED
+        for role_client in (user_client, moderator_client):
+            assert role_client.get(self.URL).status_code == (
+                HTTPStatus.FORBIDDEN
+            ), (
+                'Проверьте, что экспорт произведений доступен только '
+                'администратору.'
+            )
+        response = admin_client.get(f'{self.URL}?type=xml')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что при неизвестном формате экспорта возвращается '
+            'ответ со статусом 400.'
+        )
+
+    def test_02_ndjson(self, admin_client, admin, user_client, user,
+                       moderator_client, moderator):
+        _, titles = create_reviews(admin_client, {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client,
+        })
+        response = admin_client.get(self.URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            'Проверьте, что экспорт отдаётся потоковым ответом.'
+        )
+        assert response['Content-Type'] == 'application/x-ndjson'
+        rows = [
+            json.loads(line) for line in read_stream(response).splitlines()
+        ]
+        assert [row['id'] for row in rows] == [
+            title['id'] for title in titles
+        ]
+        assert rows[0]['category'] == titles[0]['category']
+        assert rows[0]['genre'] == sorted(titles[0]['genre'])
+        assert rows[0]['rating'] == 5
+        assert rows[0]['review_count'] == 3
+        assert rows[1]['rating'] is None
+
+    def test_03_csv(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.get(f'{self.URL}?type=csv')
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'] == 'text/csv'
+        rows = list(csv.DictReader(StringIO(read_stream(response))))
+        assert len(rows) == len(titles)
+        assert rows[0]['name'] == titles[0]['name']
+        assert rows[0]['genre'] == ','.join(sorted(titles[0]['genre']))
+
+    def test_04_queries_per_chunk(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        for title in titles:
+            for index in range(2):
+                Title.objects.create(
+                    name=f'{title["name"]} {index}', year=title['year']
+                )
+        out = StringIO()
+        with CaptureQueriesContext(connection) as context:
+            call_command('export_titles', '--chunk-size', '2', stdout=out)
+        rows = out.getvalue().splitlines()
+        assert len(rows) == 6
+        assert len(context) <= 6, (
+            'Проверьте, что экспорт выполняет не больше двух запросов на '
+            'каждую порцию произведений.'
+        )
+
+    def test_05_command_output_file(self, admin_client, tmp_path):
+        create_titles(admin_client)
+        path = tmp_path / 'titles.csv'
+        call_command('export_titles', '--type', 'csv', '--output', str(path))
+        with open(path, encoding='utf-8', newline='') as file:
+            rows = list(csv.DictReader(file))
+        assert len(rows) == 2
@@ -0,0 +1,96 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from tests.utils import create_comments, create_titles
+
+from api.v1.views import TitleViewSet
+from reviews.models import Genre, Title
+
+
+def read_stream(response):
+    assert response.streaming, (
+        'Проверьте, что при `?stream=true` список отдаётся потоковым ответом.'
+    )
+    return json.loads(b''.join(response.streaming_content))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14Streaming:
+
+    def test_01_users(self, admin_client, admin, user, moderator):
+        response = admin_client.get('/api/v1/users/?stream=true')
+        assert response.status_code == HTTPStatus.OK
+        data = read_stream(response)
+        assert sorted(item['username'] for item in data) == sorted(
+            (admin.username, user.username, moderator.username)
+        ), (
+            'Проверьте, что потоковый список пользователей содержит всех '
+            'пользователей без пагинации.'
+        )
+
+    def test_02_reviews_and_comments(self, admin_client, admin, user_client,
+                                     user, moderator_client, moderator):
+        authors_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client,
+        }
+        comments, reviews, titles = create_comments(admin_client, authors_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        paginated = admin_client.get(url).json()['results']
+        response = admin_client.get(f'{url}?stream=true')
+        assert response.status_code == HTTPStatus.OK
+        assert read_stream(response) == paginated, (
+            'Проверьте, что потоковый список отзывов совпадает с обычным.'
+        )
+
+        url = f'{url}{reviews[0]["id"]}/comments/'
+        response = admin_client.get(f'{url}?stream=true')
+        assert len(read_stream(response)) == len(comments)
+
+        response = admin_client.get(
+            '/api/v1/titles/0/reviews/?stream=true'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_empty_list(self, admin_client):
+        response = admin_client.get('/api/v1/titles/?stream=true')
+        assert response.status_code == HTTPStatus.OK
+        assert read_stream(response) == []
+
+    def test_04_prefetch_per_chunk(self, admin_client, monkeypatch):
+        monkeypatch.setattr(TitleViewSet, 'stream_chunk_size', 2)
+        create_titles(admin_client)
+        genres = list(Genre.objects.all()[:2])
+        for index in range(4):
+            Title.objects.create(
+                name=f'Произведение {index}', year=2000
+            ).genre.set(genres)
+        with CaptureQueriesContext(connection) as context:
+            data = read_stream(admin_client.get('/api/v1/titles/?stream=true'))
+        assert len(data) == 6
+        assert [item['name'] for item in data] == sorted(
+            item['name'] for item in data
+        )
+        assert all(len(item['genre']) in (1, 2) for item in data)
+        assert len(context) <= 7, (
+            'Проверьте, что жанры потокового списка загружаются одним '
+            'запросом на порцию.'
+        )
+
+    def test_05_only_admin_streams(self, client, user_client, admin_client):
+        create_titles(admin_client)
+        for role_client in (client, user_client):
+            response = role_client.get('/api/v1/titles/?stream=true')
+            assert response.status_code == HTTPStatus.OK
+            assert not response.streaming, (
+                'Проверьте, что потоковый список доступен только '
+                'администратору.'
+            )
+            assert response.json()['count'] == 2, (
+                'Проверьте, что остальные пользователи получают обычный '
+                'список с пагинацией.'
+            )
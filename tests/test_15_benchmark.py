@@ -0,0 +1,90 @@
+import json
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from api.v1.constants import BENCHMARK_ADMIN
+from api.v1.urls import v1_router
+from reviews.models import User
+
+
+def run_benchmark(output, *args):
+    call_command(
+        'benchmark_api', '--current-db', '--runs', '2',
+        '--output', str(output), *args
+    )
+    with open(output, encoding='utf-8') as file:
+        return json.load(file)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15Benchmark:
+
+    def seed(self, comments=20):
+        call_command(
+            'generate_fake_data', users=5, titles=4, reviews=12,
+            comments=comments, stdout=StringIO()
+        )
+
+    def test_01_report(self, tmp_path, admin):
+        self.seed()
+        report = run_benchmark(tmp_path / 'benchmark.json')
+
+        assert report['meta']['dataset'] == {
+            'user': 6, 'title': 4, 'review': 12, 'comment': 20
+        }
+        routes = {
+            pattern.name for pattern in v1_router.urls
+            if 'get' in getattr(pattern.callback, 'actions', {'get': None})
+        }
+        results = report['results']
+        assert {result['route'] for result in results} == routes, (
+            'Проверьте, что бенчмарк измеряет все GET-маршруты API.'
+        )
+        assert {result['client'] for result in results} == {
+            'anonymous', 'admin'
+        }
+        for result in results:
+            assert result['p50_ms'] <= result['p95_ms']
+            assert result['peak_memory_kb'] > 0
+            if result['client'] == 'admin':
+                assert result['status'] == HTTPStatus.OK, result
+        titles_list = next(
+            result for result in results
+            if result['route'] == 'titles-list'
+            and result['client'] == 'anonymous'
+        )
+        assert titles_list['queries'] > 0
+
+    def test_02_bitmap_index(self, tmp_path, admin):
+        self.seed(comments=0)
+        report = run_benchmark(tmp_path / 'benchmark.json', '--bitmap-index')
+        assert report['meta']['bitmap_index'] is True
+        filtered = [
+            result for result in report['results']
+            if result['route'] == 'titles-list' and '?' in result['url']
+        ]
+        assert len(filtered) == 6, (
+            'Проверьте, что бенчмарк измеряет список произведений с '
+            'фильтрами по жанру, категории и году.'
+        )
+        assert all(
+            result['status'] == HTTPStatus.OK for result in filtered
+        )
+
+    def test_03_current_db_is_read_only(self, tmp_path, admin):
+        self.seed()
+        first = run_benchmark(tmp_path / 'first.json')
+        second = run_benchmark(tmp_path / 'second.json')
+        assert second['meta']['dataset'] == first['meta']['dataset'], (
+            'Проверьте, что `benchmark_api --current-db` не добавляет данные '
+            'в текущую базу.'
+        )
+        assert not User.objects.filter(username=BENCHMARK_ADMIN).exists()
+
+    def test_04_current_db_needs_admin(self, tmp_path):
+        self.seed()
+        with pytest.raises(CommandError):
+            run_benchmark(tmp_path / 'benchmark.json')
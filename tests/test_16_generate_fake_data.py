@@ -0,0 +1,81 @@
+import random
+from collections import Counter
+
+import pytest
+from django.core.management import call_command
+
+from reviews.management.commands.generate_fake_data import get_zipf_counts
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+
+def generate(*args):
+    call_command(
+        'generate_fake_data',
+        '--users', '20', '--categories', '3', '--genres', '5',
+        '--titles', '30', '--reviews', '200', '--comments', '300',
+        '--batch-size', '50', *args
+    )
+
+
+def get_snapshot():
+    return (
+        list(Title.objects.order_by('id').values_list(
+            'id', 'name', 'year', 'category_id', 'rating'
+        )),
+        list(Review.objects.order_by('id').values_list(
+            'id', 'title_id', 'author_id', 'score', 'text'
+        )),
+        list(Comment.objects.order_by('id').values_list(
+            'id', 'review_id', 'author_id', 'text'
+        )),
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16GenerateFakeData:
+
+    def test_01_counts(self):
+        generate()
+        assert User.objects.count() == 20
+        assert Genre.objects.count() == 5
+        assert Title.objects.count() == 30
+        assert Title.genre.through.objects.count() == 60
+        assert Review.objects.count() == 200
+        assert Comment.objects.count() == 300
+        for title in Title.objects.all():
+            assert title.review_count == title.reviews.count(), (
+                'Проверьте, что после генерации обновляются рейтинги.'
+            )
+
+    def test_02_reproducible(self):
+        generate('--seed', '7')
+        first = get_snapshot()
+        for model in (Comment, Review, Title, Category, Genre, User):
+            model.objects.all().delete()
+        generate('--seed', '7')
+        assert get_snapshot() == first, (
+            'Проверьте, что при одинаковом seed генерируются одинаковые '
+            'данные.'
+        )
+
+    def test_03_zipf_skew(self):
+        generate('--skew', '1.5')
+        counts = sorted(
+            Title.objects.values_list('review_count', flat=True),
+            reverse=True
+        )
+        assert counts[0] > 4 * counts[len(counts) // 2], (
+            'Проверьте, что количество отзывов распределено по закону Ципфа.'
+        )
+        assert not [
+            pair for pair, count in Counter(
+                Review.objects.values_list('title_id', 'author_id')
+            ).items() if count > 1
+        ]
+
+    def test_04_zipf_counts(self):
+        rng = random.Random(0)
+        assert set(get_zipf_counts(100, 10, 0, rng)) == {10}
+        counts = get_zipf_counts(1000, 10, 1, rng, cap=150)
+        assert sum(counts) == 1000
+        assert max(counts) == 150
@@ -0,0 +1,87 @@
+import json
+import logging
+from http import HTTPStatus
+
+import pytest
+from tests.utils import create_reviews
+
+from api.v1.constants import (PERFORMANCE_HEADERS_ALWAYS,
+                              PERFORMANCE_HEADERS_REQUEST)
+
+
+def get_server_timing(response):
+    metrics = {}
+    for metric in response['Server-Timing'].split(', '):
+        name, _, value = metric.partition(';')
+        metrics[name] = value
+    return metrics
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17Performance:
+
+    URL = '/api/v1/titles/'
+
+    def test_01_headers_for_staff(self, client, admin_client, user_client):
+        response = admin_client.get(self.URL)
+        assert response.status_code == HTTPStatus.OK
+        metrics = get_server_timing(response)
+        for name in (
+            'total', 'db', 'auth', 'permissions', 'queryset', 'serialize',
+            'render',
+        ):
+            assert metrics[name].startswith('dur='), (
+                f'Проверьте, что заголовок Server-Timing содержит `{name}`.'
+            )
+        assert int(response['X-Query-Count']) > 0
+
+        response = client.get(self.URL)
+        assert 'Server-Timing' not in response, (
+            'Проверьте, что заголовки производительности не отдаются '
+            'анонимным пользователям.'
+        )
+        response = user_client.get(self.URL)
+        assert 'Server-Timing' not in response
+
+    def test_02_headers_on_request(self, client, settings):
+        settings.PERFORMANCE_HEADERS = PERFORMANCE_HEADERS_REQUEST
+        assert 'Server-Timing' not in client.get(self.URL)
+        response = client.get(self.URL, HTTP_X_PROFILE='1')
+        assert 'Server-Timing' in response
+        assert 'X-Query-Count' in response
+
+    def test_03_query_count(self, admin_client, admin, user_client, user,
+                            moderator_client, moderator, settings,
+                            django_assert_num_queries):
+        settings.PERFORMANCE_HEADERS = PERFORMANCE_HEADERS_ALWAYS
+        _, titles = create_reviews(admin_client, {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client,
+        })
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with django_assert_num_queries(3) as context:
+            response = admin_client.get(url)
+        assert int(response['X-Query-Count']) == len(context), (
+            'Проверьте, что X-Query-Count совпадает с числом запросов к БД.'
+        )
+
+    def test_04_structured_log(self, user_client, user, caplog):
+        with caplog.at_level(logging.INFO, logger='api.performance'):
+            user_client.get(self.URL)
+        records = [
+            json.loads(record.getMessage()) for record in caplog.records
+            if record.name == 'api.performance'
+        ]
+        assert len(records) == 1, (
+            'Проверьте, что каждый запрос логируется в `api.performance`.'
+        )
+        record = records[0]
+        assert record['path'] == self.URL
+        assert record['status'] == HTTPStatus.OK
+        assert record['user'] == user.pk
+        assert record['response_bytes'] > 0
+        assert record['total_ms'] >= record['db_ms']
+        assert {'auth', 'permissions', 'serialize', 'render'} <= set(
+            record['stages_ms']
+        )
@@ -0,0 +1,54 @@
+import pytest
+from django.db import connection
+
+from reviews.models import Comment, Genre, Review, Title
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite',
+    reason='Планы запросов проверяются только для SQLite.'
+)
+
+
+def check_plan(queryset, index):
+    plan = queryset.explain()
+    assert f'INDEX {index}' in plan, (
+        f'Проверьте, что запрос использует индекс `{index}`:\n{plan}'
+    )
+    assert 'TEMP B-TREE' not in plan, (
+        f'Проверьте, что запрос не сортируется во временном дереве:\n{plan}'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Indexes:
+
+    def test_01_reviews_by_title(self):
+        check_plan(
+            Review.objects.filter(title_id=1).order_by('-pub_date', '-id'),
+            'review_title_pub_date_idx'
+        )
+
+    def test_02_comments_by_review(self):
+        check_plan(
+            Comment.objects.filter(review_id=1).order_by('-pub_date', '-id'),
+            'comment_review_pub_date_idx'
+        )
+
+    def test_03_titles_by_name(self):
+        check_plan(Title.objects.order_by('name', 'id'), 'title_name_idx')
+
+    def test_04_titles_by_category_and_year(self):
+        check_plan(
+            Title.objects.filter(category_id=1, year=2000).order_by(),
+            'title_category_year_idx'
+        )
+
+    def test_05_slug_iexact(self):
+        check_plan(
+            Genre.objects.filter(slug__iexact='Drama').order_by(),
+            'reviews_genre_slug_iexact_idx'
+        )
+        check_plan(
+            Title.objects.filter(category__slug__iexact='Movie').order_by(),
+            'reviews_category_slug_iexact_idx'
+        )
@@ -0,0 +1,146 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from tests.utils import create_single_review, create_titles
+
+from reviews.models import Review, TitleRanking
+
+
+def get_ids(client, url):
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f'Проверьте, что GET-запрос к `{url}` возвращает ответ со статусом '
+        '200.'
+    )
+    return [title['id'] for title in response.json()]
+
+
+def get_snapshot():
+    return sorted(TitleRanking.objects.values_list(
+        'title_id', 'category_id', 'genre_id', 'score_sum', 'review_count',
+        'score_mean', 'trending'
+    ), key=str)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Rankings:
+
+    TOP_URL = '/api/v1/titles/top/'
+    TRENDING_URL = '/api/v1/titles/trending/'
+
+    def test_01_top(self, client, admin_client, user_client,
+                    moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        assert get_ids(client, self.TOP_URL) == [], (
+            'Проверьте, что произведения без отзывов не попадают в рейтинг.'
+        )
+        review = create_single_review(user_client, first, 'Отзыв', 6).json()
+        create_single_review(moderator_client, second, 'Отзыв', 9)
+        create_single_review(admin_client, second, 'Отзыв', 7)
+
+        assert get_ids(client, self.TOP_URL) == [second, first], (
+            'Проверьте, что рейтинг упорядочен по убыванию оценки.'
+        )
+        assert get_ids(client, f'{self.TOP_URL}?limit=1') == [second]
+        assert get_ids(client, f'{self.TOP_URL}?category=films') == [first]
+        assert get_ids(client, f'{self.TOP_URL}?genre=drama') == [second]
+        assert get_ids(client, f'{self.TOP_URL}?genre=unknown') == []
+
+        user_client.patch(
+            f'/api/v1/titles/{first}/reviews/{review["id"]}/',
+            data={'score': 10}
+        )
+        assert get_ids(client, self.TOP_URL) == [first, second], (
+            'Проверьте, что рейтинг обновляется после изменения оценки.'
+        )
+
+        for query in ('category=films&genre=drama', 'limit=0', 'limit=x'):
+            response = client.get(f'{self.TOP_URL}?{query}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что запрос к `{self.TOP_URL}?{query}` '
+                'возвращает ответ со статусом 400.'
+            )
+
+    def test_02_trending(self, client, admin_client, user_client,
+                         moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        create_single_review(user_client, first, 'Отзыв', 5)
+        create_single_review(moderator_client, first, 'Отзыв', 5)
+        create_single_review(user_client, second, 'Отзыв', 8)
+        assert get_ids(client, self.TRENDING_URL) == [first, second], (
+            'Проверьте, что популярные произведения упорядочены по числу '
+            'недавних отзывов.'
+        )
+
+        Review.objects.filter(title_id=first).update(
+            pub_date=timezone.now() - timedelta(days=30)
+        )
+        call_command('refresh_rankings')
+        assert get_ids(client, self.TRENDING_URL) == [second], (
+            'Проверьте, что `refresh_rankings` исключает старые отзывы из '
+            'популярных произведений.'
+        )
+        review = Review.objects.filter(title_id=first).first()
+        review.delete()
+        assert TitleRanking.objects.overall().get(
+            title_id=first
+        ).trending == 0
+
+    def test_03_incremental_matches_refresh(self, admin_client, user_client,
+                                            moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        create_single_review(user_client, first, 'Отзыв', 4)
+        create_single_review(moderator_client, second, 'Отзыв', 9)
+        admin_client.patch(
+            f'/api/v1/titles/{first}/',
+            data={'genre': ['drama'], 'category': 'books'}
+        )
+        admin_client.delete('/api/v1/genres/comedy/')
+        admin_client.delete('/api/v1/categories/films/')
+
+        snapshot = get_snapshot()
+        call_command('refresh_rankings')
+        assert snapshot == get_snapshot(), (
+            'Проверьте, что рейтинги, обновляемые при записи, совпадают с '
+            'результатом `refresh_rankings`.'
+        )
+        assert get_ids(
+            admin_client, f'{self.TOP_URL}?category=books'
+        ) == [second, first]
+        assert get_ids(admin_client, f'{self.TOP_URL}?genre=horror') == []
+
+    def test_04_queries(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        for title in titles:
+            create_single_review(user_client, title['id'], 'Отзыв', 5)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{self.TOP_URL}?genre=horror')
+        assert response.status_code == HTTPStatus.OK
+        assert len(context) <= 2, (
+            'Проверьте, что рейтинг читается одним запросом к таблице '
+            'рейтингов и одним запросом жанров.'
+        )
+
+    def test_05_top_uses_exact_mean(self, client, admin_client, user_client,
+                                    moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        for author_client in (admin_client, user_client, moderator_client):
+            create_single_review(author_client, first, 'Отзыв', 9)
+        create_single_review(admin_client, second, 'Отзыв', 10)
+        create_single_review(user_client, second, 'Отзыв', 9)
+        assert get_ids(client, self.TOP_URL) == [second, first], (
+            'Проверьте, что рейтинг упорядочен по точной средней оценке, а '
+            'не по округлённой.'
+        )
+        assert TitleRanking.objects.overall().get(
+            title_id=second
+        ).score_mean == 9.5
@@ -0,0 +1,103 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from tests.utils import create_single_review, create_titles
+
+from reviews.models import Category, Genre, Title
+
+
+def get_facets(client, query):
+    response = client.get(f'/api/v1/titles/?{query}')
+    assert response.status_code == HTTPStatus.OK, (
+        f'Проверьте, что запрос к `/api/v1/titles/?{query}` возвращает '
+        'ответ со статусом 200.'
+    )
+    return response.json()['facets']
+
+
+def get_counts(facet, key='slug'):
+    return [(item[key], item['count']) for item in facet]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Facets:
+
+    def create_catalog(self, admin_client):
+        create_titles(admin_client)
+        Title.objects.create(
+            name='Чужие', year=1984,
+            category=Category.objects.get(slug='films')
+        ).genre.set([Genre.objects.get(slug='horror')])
+
+    def test_01_catalog(self, client, admin_client):
+        self.create_catalog(admin_client)
+        facets = get_facets(client, 'facets=genre,category,year')
+        assert list(facets) == ['genre', 'category', 'year']
+        assert get_counts(facets['genre']) == [
+            ('horror', 2), ('drama', 1), ('comedy', 1)
+        ], (
+            'Проверьте, что фасет жанров упорядочен по убыванию количества '
+            'произведений.'
+        )
+        assert facets['genre'][0]['name'] == 'Ужасы'
+        assert get_counts(facets['category']) == [('films', 2), ('books', 1)]
+        assert get_counts(facets['year'], 'year') == [(1988, 1), (1984, 2)]
+
+    def test_02_filtered(self, client, admin_client):
+        self.create_catalog(admin_client)
+        facets = get_facets(client, 'genre=horror&facets=category,year')
+        assert list(facets) == ['category', 'year']
+        assert get_counts(facets['category']) == [('films', 2)], (
+            'Проверьте, что фасеты считаются по отфильтрованным '
+            'произведениям.'
+        )
+        assert get_counts(facets['year'], 'year') == [(1984, 2)]
+
+        facets = get_facets(client, 'search=Терминатор&facets=genre')
+        assert get_counts(facets['genre']) == [('comedy', 1), ('horror', 1)]
+
+        response = client.get('/api/v1/titles/')
+        assert 'facets' not in response.json()
+        response = client.get('/api/v1/titles/?facets=genre,rating')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что при неизвестном фасете возвращается ответ со '
+            'статусом 400.'
+        )
+
+    def test_03_queries(self, client, admin_client):
+        self.create_catalog(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            get_facets(client, 'year=1984&facets=genre,category,year')
+        assert len(context) <= 5, (
+            'Проверьте, что все фасеты считаются двумя сгруппированными '
+            'запросами.'
+        )
+
+        get_facets(client, 'facets=genre,category,year')
+        with CaptureQueriesContext(connection) as context:
+            facets = get_facets(client, 'facets=year')
+        assert len(context) <= 3, (
+            'Проверьте, что фасеты каталога без фильтров кешируются.'
+        )
+        assert get_counts(facets['year'], 'year') == [(1988, 1), (1984, 2)]
+
+        Title.objects.create(name='Чужой', year=1979)
+        facets = get_facets(client, 'facets=year&page=1')
+        assert get_counts(facets['year'], 'year')[-1] == (1979, 1), (
+            'Проверьте, что кеш фасетов сбрасывается при изменении '
+            'произведений.'
+        )
+
+    def test_04_reviews_keep_cache(self, client, admin_client, user_client):
+        self.create_catalog(admin_client)
+        get_facets(client, 'facets=genre,category,year')
+        title = Title.objects.order_by('id').first()
+        create_single_review(user_client, title.id, 'Отзыв', 5)
+        with CaptureQueriesContext(connection) as context:
+            get_facets(client, 'facets=genre')
+        assert len(context) <= 3, (
+            'Проверьте, что запись отзыва не сбрасывает кеш фасетов '
+            'каталога: они зависят только от состава каталога.'
+        )
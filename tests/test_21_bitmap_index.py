@@ -0,0 +1,111 @@
+import random
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from tests.utils import create_titles
+
+from api.v1.bitmaps import get_bits, get_ranks, title_index
+from reviews.models import Category, Genre, Review, Title
+
+QUERIES = (
+    '',
+    'genre=horror',
+    'genre=HORROR&category=films',
+    'category=books',
+    'year=1984',
+    'genre=drama&year=1984',
+    'genre=unknown',
+    'page=2',
+    'genre=horror&page=2',
+    'name=Extra&genre=comedy',
+)
+
+
+def get_page(client, query):
+    cache.clear()
+    response = client.get(f'/api/v1/titles/?{query}')
+    assert response.status_code == HTTPStatus.OK, (
+        f'Проверьте, что запрос к `/api/v1/titles/?{query}` возвращает '
+        'ответ со статусом 200.'
+    )
+    data = response.json()
+    return data['count'], [title['id'] for title in data['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21BitmapIndex:
+
+    def create_catalog(self, admin_client):
+        create_titles(admin_client)
+        genres = list(Genre.objects.order_by('slug'))
+        categories = list(Category.objects.order_by('slug'))
+        for index in range(25):
+            title = Title.objects.create(
+                name=f'Extra {index % 7}',
+                year=1984 + index % 3,
+                category=categories[index % 2] if index % 5 else None
+            )
+            title.genre.set(genres[index % 3:index % 3 + 1 + index % 2])
+
+    def test_01_ranks(self):
+        rng = random.Random(1)
+        ranks = sorted(rng.sample(range(1000), 200))
+        bits = get_bits(ranks, 1000)
+        for start, stop in ((0, 10), (5, 17), (190, 210), (300, 310)):
+            assert get_ranks(bits, start, stop) == ranks[start:stop]
+
+    def test_02_same_as_sql(self, client, admin_client, settings):
+        self.create_catalog(admin_client)
+        for query in QUERIES:
+            settings.TITLE_BITMAP_INDEX = False
+            expected = get_page(client, query)
+            settings.TITLE_BITMAP_INDEX = True
+            assert get_page(client, query) == expected, (
+                'Проверьте, что индекс битовых карт возвращает те же '
+                f'произведения, что и SQL, для `?{query}`.'
+            )
+
+    def test_03_queries_and_rebuild(self, client, admin_client, settings):
+        settings.TITLE_BITMAP_INDEX = True
+        self.create_catalog(admin_client)
+        url = '/api/v1/titles/?genre=horror&category=films'
+        count, _ = get_page(client, 'genre=horror&category=films')
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{url}&page=1')
+        assert response.status_code == HTTPStatus.OK
+        assert len(context) <= 2, (
+            'Проверьте, что при включённом индексе страница загружается '
+            'одним запросом `id__in` и запросом жанров.'
+        )
+
+        Title.objects.create(
+            name='Новое', year=2000,
+            category=Category.objects.get(slug='films')
+        ).genre.set([Genre.objects.get(slug='horror')])
+        assert client.get(url).json()['count'] == count + 1, (
+            'Проверьте, что индекс перестраивается после изменения '
+            'произведений.'
+        )
+
+    def test_04_reviews_do_not_rebuild(self, client, admin_client, admin,
+                                       settings):
+        settings.TITLE_BITMAP_INDEX = True
+        self.create_catalog(admin_client)
+        url = '/api/v1/titles/?genre=horror&category=films'
+        title_id = client.get(url).json()['results'][0]['id']
+        state = title_index.state
+
+        Review.objects.create(
+            title_id=title_id, author=admin, text='Отзыв', score=7
+        )
+        results = client.get(url).json()['results']
+        assert title_index.state is state, (
+            'Проверьте, что запись отзыва не перестраивает индекс битовых '
+            'карт.'
+        )
+        assert results[0]['rating'] == 7, (
+            'Проверьте, что рейтинг на странице берётся из базы данных.'
+        )